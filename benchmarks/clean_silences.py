@@ -0,0 +1,126 @@
+"""
+Benchmark silence cleaning of MP3: re-encoding (`silenceremove` then
+`libmp3lame`, default `CleanSilences` mode) against lossless cutting
+(`silencedetect` then MP3 frames copied by `Mp3FrameCutter`, `--lossless`).
+
+Generates synthetic MP3 (sine, 128 kb/s) of growing duration with a long
+silence every minute, then cleans each one with both modes. Re-encoding
+decodes and encodes the whole file, lossless mode only decodes it (for
+detection) and copies frames.
+
+Usage: python benchmarks/clean_silences.py [--minutes 5 10 20]
+
+Requires ffmpeg.
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from audiobook.audio import Mp3FrameCutter  # noqa: E402  # pylint: disable=C0413
+
+
+def make_mp3(directory: Path, minutes: int) -> Path:
+    """Generate a MP3 of `minutes`: 55s of sine then 5s of silence, repeated"""
+    mp3 = directory / f"track_{minutes}.mp3"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate=44100:duration={minutes * 60}",
+            "-af",
+            "volume='if(gt(mod(t,60),55),0,1)':eval=frame",
+            "-codec:a",
+            "libmp3lame",
+            "-b:a",
+            "128k",
+            str(mp3),
+        ],
+        check=True,
+    )
+    return mp3
+
+
+def reencode(mp3: Path, output: Path) -> float:
+    """`CleanSilences` re-encoding mode, return elapsed seconds"""
+    begin = time.perf_counter()
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-i",
+            str(mp3),
+            "-af",
+            "silenceremove=stop_periods=-1:stop_duration=2.0:stop_threshold=-40dB",
+            "-codec:a",
+            "libmp3lame",
+            "-b:a",
+            "128k",
+            str(output),
+        ],
+        check=True,
+    )
+    return time.perf_counter() - begin
+
+
+def lossless(mp3: Path, output: Path) -> float:
+    """`CleanSilences` lossless mode, return elapsed seconds"""
+    begin = time.perf_counter()
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(mp3),
+            "-af",
+            "silencedetect=noise=-40dB:d=2.0",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    starts, ends = [], []
+    for line in result.stderr.splitlines():
+        if "silence_start:" in line:
+            starts.append(float(line.rsplit(":", 1)[1]))
+        elif "silence_end:" in line:
+            ends.append(float(line.split("silence_end:")[1].split("|")[0]))
+    ends += [float("inf")] * (len(starts) - len(ends))
+    intervals = [(s + 0.25, e - 0.25) for s, e in zip(starts, ends)]
+
+    Mp3FrameCutter(mp3).cut(intervals, output)
+    return time.perf_counter() - begin
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[5, 10, 20])
+    args = parser.parse_args()
+
+    print(f"{'track':>8} {'re-encode':>10} {'lossless':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            mp3 = make_mp3(Path(tmp), minutes)
+            encoded = reencode(mp3, Path(tmp) / "reencode.mp3")
+            copied = lossless(mp3, Path(tmp) / "lossless.mp3")
+            print(f"{minutes:>6}mn {encoded:>9.2f}s {copied:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
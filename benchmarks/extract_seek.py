@@ -0,0 +1,99 @@
+"""
+Benchmark chapter extraction seeking: output seeking (`-i file -ss -to`)
+against input seeking (`-ss -to -i file`) used by `Extractor`.
+
+Generates synthetic M4B (sine, AAC) of growing duration with one chapter
+every `--chapter` seconds, then decodes every chapter with both modes
+(decode only, `-f null`). Output seeking decodes from the start of the book
+for each chapter (O(n²)), input seeking only decodes the chapter (O(n)).
+
+Usage: python benchmarks/extract_seek.py [--chapter 60] [--minutes 10 20 40]
+
+Requires ffmpeg.
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+
+def make_m4b(directory: Path, minutes: int, chapter_seconds: int) -> Path:
+    """Generate a M4B of `minutes` with a chapter every `chapter_seconds`"""
+    duration = minutes * 60
+    m4b = directory / f"book_{minutes}.m4b"
+    meta = directory / f"book_{minutes}.txt"
+
+    lines = [";FFMETADATA1"]
+    for i, start in enumerate(range(0, duration, chapter_seconds)):
+        end = min(start + chapter_seconds, duration)
+        lines.append(
+            f"\n[CHAPTER]\nTIMEBASE=1/1000\nSTART={start * 1000}\n"
+            f"END={end * 1000}\ntitle=Chapter {i + 1}"
+        )
+    meta.write_text("\n".join(lines), encoding="utf-8")
+
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate=44100:duration={duration}",
+            "-i",
+            str(meta),
+            "-map_metadata",
+            "1",
+            "-map_chapters",
+            "1",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "64k",
+            str(m4b),
+        ],
+        check=True,
+    )
+    return m4b
+
+
+def decode_chapters(m4b: Path, minutes: int, chapter_seconds: int, input_seek: bool):
+    """Decode each chapter, return total elapsed seconds"""
+    begin = time.perf_counter()
+    for start in range(0, minutes * 60, chapter_seconds):
+        seek = ["-ss", str(start), "-to", str(start + chapter_seconds)]
+        cmd = ["ffmpeg", "-y", "-v", "error"]
+        if input_seek:
+            cmd += seek + ["-i", str(m4b)]
+        else:
+            cmd += ["-i", str(m4b)] + seek
+        cmd += ["-f", "null", "-"]
+        subprocess.run(cmd, check=True)
+    return time.perf_counter() - begin
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chapter", type=int, default=60, help="Chapter seconds")
+    parser.add_argument("--minutes", type=int, nargs="+", default=[10, 20, 40])
+    args = parser.parse_args()
+
+    print(f"{'book':>8} {'chapters':>9} {'output seek':>12} {'input seek':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            m4b = make_m4b(Path(tmp), minutes, args.chapter)
+            chapters = -(-minutes * 60 // args.chapter)
+            output_seek = decode_chapters(m4b, minutes, args.chapter, False)
+            input_seek = decode_chapters(m4b, minutes, args.chapter, True)
+            print(
+                f"{minutes:>6}mn {chapters:>9} {output_seek:>11.2f}s "
+                f"{input_seek:>10.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -34,19 +34,97 @@ class AudiobookArgs:
             action="store_true",
             help="Use Rust with audiobook-forge crate to forge M4B",
         )
+        m_build.add_argument(
+            "--strip-covers",
+            action="store_true",
+            help="Remove embedded covers from MP3 source files (rewrite them).",
+        )
         m_build.add_argument("-o", "--output")
+        self._add_encode_arguments(m_build)
 
         # Clean
         m_clean = subparsers.add_parser("clean", help="Clean MP3 files from silences")
         m_clean.add_argument("mp3_directory", help="Source directory")
+        m_clean.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of files cleaned in parallel (default: CPU count)",
+        )
+        m_clean.add_argument(
+            "--lossless",
+            action="store_true",
+            help="Cut silences by copying MP3 frames, without re-encoding",
+        )
+        m_clean.add_argument(
+            "--trim",
+            type=float,
+            nargs="?",
+            const=30.0,
+            metavar="SECONDS",
+            help="Only trim leading and trailing silences, analyzing the first "
+            "and last SECONDS of each file (default: 30), without re-encoding",
+        )
+        m_clean.add_argument(
+            "--force",
+            action="store_true",
+            help="Clean again files already cleaned with the same settings",
+        )
+        m_clean.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only analyze silences and write a report, files are not modified",
+        )
+        m_clean.add_argument(
+            "--report",
+            help="Silences report path, JSON or CSV (default with --dry-run: "
+            "clean_report.json into mp3_directory)",
+        )
 
         # Extract
         m_extract = subparsers.add_parser("extract", help="Extract MP3 files from M4B")
         m_extract.add_argument("m4b_directory", help="Source directory")
+        m_extract.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of parallel encodes (default: CPU count)",
+        )
+        m_extract.add_argument(
+            "-f",
+            "--format",
+            choices=["mp3", "m4a"],
+            default="mp3",
+            help="Output format: mp3 (encode) or m4a (AAC stream copy, no encode)",
+        )
+        m_extract.add_argument(
+            "--chapters",
+            help="Chapters to extract, 1-based (like `1-3,7`)",
+        )
+        m_extract.add_argument(
+            "--title",
+            help="Extract only chapters whose title matches this regex",
+        )
+        m_extract.add_argument(
+            "--from",
+            dest="time_from",
+            help="Start of time window to extract (`SS`, `MM:SS` or `HH:MM:SS`)",
+        )
+        m_extract.add_argument(
+            "--to",
+            dest="time_to",
+            help="End of time window to extract (`SS`, `MM:SS` or `HH:MM:SS`)",
+        )
+        m_extract.add_argument(
+            "--force",
+            action="store_true",
+            help="Extract again files already up to date",
+        )
 
         # Forge
         m_forge = subparsers.add_parser("forge", help="Forge MP3 file to M4B")
         m_forge.add_argument("mp3_directory", help="Source directory")
+        self._add_encode_arguments(m_forge)
 
         # Fusion
         m_fusion = subparsers.add_parser("fusion", help="Add MP3 files to existing M4B")
@@ -62,8 +140,23 @@ class AudiobookArgs:
         self.m4b_output: Optional[str] = getattr(args, "output", None)
         self.clear_old_m4b: bool = getattr(args, "clear", False)
         self.use_rust: bool = getattr(args, "rust", False)
+        self.strip_covers: bool = getattr(args, "strip_covers", False)
         self.m4b_directory: Optional[str] = getattr(args, "m4b_directory", None)
         self.asin: Optional[str] = getattr(args, "asin", None)
+        self.jobs: Optional[int] = getattr(args, "jobs", None)
+        self.remove_silences: bool = getattr(args, "remove_silences", False)
+        self.loudnorm: Optional[float] = getattr(args, "loudnorm", None)
+        self.clean_lossless: bool = getattr(args, "lossless", False)
+        self.clean_trim: Optional[float] = getattr(args, "trim", None)
+        self.clean_force: bool = getattr(args, "force", False)
+        self.clean_dry_run: bool = getattr(args, "dry_run", False)
+        self.clean_report: Optional[str] = getattr(args, "report", None)
+        self.extract_format: str = getattr(args, "format", "mp3")
+        self.extract_chapters: Optional[str] = getattr(args, "chapters", None)
+        self.extract_title: Optional[str] = getattr(args, "title", None)
+        self.extract_from: Optional[str] = getattr(args, "time_from", None)
+        self.extract_to: Optional[str] = getattr(args, "time_to", None)
+        self.extract_force: bool = getattr(args, "force", False)
 
         if self.command in ["audible"] and self.asin is None:
             parser.error(
@@ -87,3 +180,21 @@ class AudiobookArgs:
             parser.error(
                 f"L'argument 'mp3_directory' est requis pour la commande {self.command}"
             )
+
+    @staticmethod
+    def _add_encode_arguments(parser: ArgumentParser) -> None:
+        """Filters applied while encoding MP3 to AAC (build, forge)"""
+        parser.add_argument(
+            "--remove-silences",
+            action="store_true",
+            help="Remove silences while encoding, like `clean` without its own "
+            "MP3 encode",
+        )
+        parser.add_argument(
+            "--loudnorm",
+            type=float,
+            nargs="?",
+            const=-16.0,
+            metavar="LUFS",
+            help="Normalize loudness while encoding (default target: -16 LUFS)",
+        )
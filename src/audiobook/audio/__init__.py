@@ -1,5 +1,10 @@
 from .audio_metadata_manager import AudioMetadataManager
+from .id3_header_reader import ID3HeaderReader
+from .mp3_frame_cutter import Mp3Frame, Mp3FrameCutter
 
 __all__ = [
     "AudioMetadataManager",
+    "ID3HeaderReader",
+    "Mp3Frame",
+    "Mp3FrameCutter",
 ]
@@ -22,6 +22,7 @@ from mutagen.id3._frames import (
     APIC,
 )
 from audiobook.audio.types import AudioTags
+from audiobook.audio.id3_header_reader import ID3HeaderReader
 from .audio_handler import AudioHandler
 
 
@@ -30,8 +31,8 @@ class MP3Handler(AudioHandler):
         self.path = str(path)
 
     def extract(self, data: AudioTags) -> None:
-        audio = MP3(self.path, ID3=ID3)
-        tags = audio.tags  # type: ignore
+        # Text frames only, cover is not loaded
+        tags = ID3HeaderReader(self.path).tags()
 
         if tags is None:
             return
@@ -187,11 +188,6 @@ class MP3Handler(AudioHandler):
 
     def has_cover(self) -> bool:
         try:
-            audio = MP3(self.path, ID3=ID3)
-            return (
-                audio.tags is not None  # type: ignore
-                and "APIC:" in audio.tags  # type: ignore
-                or any(k.startswith("APIC") for k in audio.tags.keys())  # type: ignore
-            )
+            return ID3HeaderReader(self.path).has_cover()
         except Exception:
             return False
@@ -0,0 +1,227 @@
+"""Read ID3v2 text frames of MP3 without loading binary frames (covers...)"""
+
+import hashlib
+import io
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Optional, Set, Union
+from mutagen.easyid3 import EasyID3
+from mutagen.id3 import ID3, ID3NoHeaderError
+from mutagen.mp3 import MPEGInfo
+
+_FRAME_ID_V22 = re.compile(rb"^[A-Z0-9]{3}$")
+_FRAME_ID_V23 = re.compile(rb"^[A-Z0-9]{4}$")
+
+
+class ID3HeaderReader:
+    """
+    Read ID3v2 text frames of MP3 without loading binary frames.
+
+    Only frame headers are read from disk: text frames (`T***`, `COMM`, `USLT`)
+    are kept, every other frame (`APIC`, `GEOB`, `PRIV`...) is skipped by size
+    with a seek. Kept frames are handed to mutagen, so `tags()` and `easy()`
+    return regular `ID3` and `EasyID3` objects, read-only: they are not bound
+    to the file and must not be saved.
+    """
+
+    TEXT_FRAMES_V22 = ("COM", "ULT")
+    TEXT_FRAMES_V23 = ("COMM", "USLT")
+    CHUNK_SIZE: int = 1024 * 1024
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        # Frame IDs found into ID3v2 tag, skipped frames included
+        self.frame_ids: Set[str] = set()
+        # ID3v2 tag size with header: offset of the first MPEG frame
+        self.tag_size: int = 0
+        self._data: Optional[bytes] = None
+        # ID3v1 tag (last 128 bytes) is present
+        self.has_v1 = False
+        self._read()
+
+    def tags(self) -> Optional[ID3]:
+        """Get text frames as `ID3`, `None` if file has no tags"""
+        if self._data is None:
+            return None
+        try:
+            return ID3(io.BytesIO(self._data), load_v1=self.has_v1)
+        except ID3NoHeaderError:
+            return None
+
+    def easy(self) -> Optional[EasyID3]:
+        """Get text frames as `EasyID3`, `None` if file has no tags"""
+        if self._data is None:
+            return None
+        easy = EasyID3()
+        try:
+            easy.load(io.BytesIO(self._data), load_v1=self.has_v1)  # type: ignore
+        except ID3NoHeaderError:
+            return None
+        return easy
+
+    def info(self) -> MPEGInfo:
+        """Get MPEG stream info (duration, bitrate...) starting after ID3v2 tag"""
+        with open(self.path, "rb") as f:
+            return MPEGInfo(f, self.tag_size)
+
+    def title(self) -> Optional[str]:
+        """Get `TIT2` frame value"""
+        tags = self.tags()
+        if tags is None:
+            return None
+        frame = tags.get("TIT2")  # type: ignore
+        if frame and frame.text and str(frame.text[0]).strip():  # type: ignore
+            return str(frame.text[0])  # type: ignore
+        return None
+
+    def audio_hash(self) -> bytes:
+        """SHA-256 of audio data only: ID3v2 tag (start) and ID3v1 tag (end) are skipped"""
+        digest = hashlib.sha256()
+        end = os.path.getsize(self.path)
+        if self.has_v1:
+            end -= 128
+
+        with open(self.path, "rb") as f:
+            f.seek(self.tag_size)
+            remaining = end - self.tag_size
+            while remaining > 0:
+                chunk = f.read(min(self.CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+
+        return digest.digest()
+
+    def has_cover(self) -> bool:
+        """Check if ID3v2 tag has a picture frame, without reading it"""
+        return "APIC" in self.frame_ids or "PIC" in self.frame_ids
+
+    def _read(self) -> None:
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            file_size = f.tell()
+            if file_size >= 128:
+                f.seek(-128, os.SEEK_END)
+                v1 = f.read(128)
+                self.has_v1 = v1.startswith(b"TAG")
+            else:
+                v1 = b""
+
+            f.seek(0)
+            header = f.read(10)
+            if len(header) < 10 or not header.startswith(b"ID3"):
+                # No ID3v2 tag: only ID3v1 (128 bytes) can be there,
+                # prefixed so that mutagen can seek back from the end
+                if self.has_v1:
+                    self._data = bytes(10) + v1
+                return
+
+            vmaj, vrev, flags = header[3], header[4], header[5]
+            size = self._syncsafe(header[6:10])
+            self.tag_size = size + 10
+            if flags & 0x10:  # footer (ID3v2.4)
+                self.tag_size += 10
+
+            if vmaj not in (2, 3, 4) or (vmaj < 4 and flags & 0x80):
+                # Unsupported version or whole tag unsynchronised:
+                # frame sizes can't be trusted to seek, read the full tag
+                body = f.read(size)
+            else:
+                body = self._read_frames(f, vmaj, flags, 10 + size)
+                flags &= ~0x40 & ~0x10  # extended header and footer are dropped
+
+        data = b"ID3" + bytes([vmaj, vrev, flags]) + self._to_syncsafe(len(body))
+        data += body
+        if self.has_v1:
+            data += v1
+        self._data = data
+
+    def _read_frames(
+        self, f: io.BufferedReader, vmaj: int, flags: int, end: int
+    ) -> bytes:
+        """Walk frame headers, read text frames, seek over the others"""
+        if flags & 0x40:
+            ext_size = f.read(4)
+            if _FRAME_ID_V23.match(ext_size):
+                # Flag set without extended header
+                f.seek(-4, os.SEEK_CUR)
+            elif vmaj == 4:
+                f.seek(self._syncsafe(ext_size) - 4, os.SEEK_CUR)
+            else:
+                f.seek(struct.unpack(">L", ext_size)[0], os.SEEK_CUR)
+
+        header_size = 6 if vmaj == 2 else 10
+        frame_id_re = _FRAME_ID_V22 if vmaj == 2 else _FRAME_ID_V23
+        kept = self.TEXT_FRAMES_V22 if vmaj == 2 else self.TEXT_FRAMES_V23
+        syncsafe = vmaj == 4
+        body = bytearray()
+
+        while f.tell() + header_size <= end:
+            frame_header = f.read(header_size)
+            frame_id = frame_header[:3] if vmaj == 2 else frame_header[:4]
+            if not frame_id_re.match(frame_id):
+                break  # padding
+
+            if vmaj == 2:
+                frame_size = struct.unpack(">L", b"\x00" + frame_header[3:6])[0]
+            elif syncsafe:
+                frame_size = self._syncsafe(frame_header[4:8])
+                # iTunes used to write plain integers into ID3v2.4
+                if not self._is_frame_at(f, frame_size, end, frame_id_re):
+                    plain_size = struct.unpack(">L", frame_header[4:8])[0]
+                    if self._is_frame_at(f, plain_size, end, frame_id_re):
+                        frame_size = plain_size
+                        syncsafe = False
+            else:
+                frame_size = struct.unpack(">L", frame_header[4:8])[0]
+
+            name = frame_id.decode("ascii")
+            self.frame_ids.add(name)
+
+            if name.startswith("T") or name in kept:
+                payload = f.read(frame_size)
+                if vmaj == 4:
+                    # Normalize size encoding so that mutagen parses it as is
+                    frame_header = (
+                        frame_header[:4]
+                        + self._to_syncsafe(len(payload))
+                        + frame_header[8:10]
+                    )
+                body += frame_header + payload
+            else:
+                f.seek(frame_size, os.SEEK_CUR)
+
+        return bytes(body)
+
+    def _is_frame_at(
+        self,
+        f: io.BufferedReader,
+        offset: int,
+        end: int,
+        frame_id_re: re.Pattern[bytes],
+    ) -> bool:
+        """Check if a frame header (or padding, or tag end) follows `offset` bytes"""
+        position = f.tell()
+        target = position + offset
+        if target > end:
+            return False
+        if target + 4 > end:
+            return True
+        f.seek(target)
+        next_id = f.read(4)
+        f.seek(position)
+        return next_id == b"\x00\x00\x00\x00" or bool(frame_id_re.match(next_id))
+
+    @staticmethod
+    def _syncsafe(data: bytes) -> int:
+        value = 0
+        for byte in data:
+            value = (value << 7) | (byte & 0x7F)
+        return value
+
+    @staticmethod
+    def _to_syncsafe(value: int) -> bytes:
+        return bytes((value >> shift) & 0x7F for shift in (21, 14, 7, 0))
@@ -0,0 +1,274 @@
+"""Cut time intervals out of MP3 by copying frames, without re-encoding"""
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from .id3_header_reader import ID3HeaderReader
+
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_SAMPLE_RATES = (44100, 48000, 32000)
+# Encodeurs écrivant l'extension LAME après les champs Xing/Info
+_LAME_ENCODERS = (b"LAME", b"Lavc", b"Lavf")
+_LAME_SIZE = 36
+
+
+def _crc16(data: bytes, crc: int = 0) -> int:
+    """CRC-16 (polynomial 0x8005, reflected) used by LAME tag"""
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+@dataclass
+class Mp3Frame:
+    """MPEG audio Layer III frame position into file"""
+
+    offset: int
+    size: int
+    samples: int
+    sample_rate: int
+    # Octets de données principales pris dans les frames précédentes (bit reservoir)
+    main_data_begin: int
+    # Octets de données principales portés par cette frame
+    main_data_size: int
+
+
+class Mp3FrameCutter:
+    """
+    Cut time intervals out of MP3 by copying frames, without re-encoding.
+
+    Frames fully inside an interval are dropped, all others are copied as is
+    with ID3v2 tag (start) and trailing data (ID3v1, APE). As Layer III frames
+    can use main data of previous frames (bit reservoir), dropped frames just
+    before a kept one are kept back until its `main_data_begin` is covered.
+    Xing/Info header (frame count, size, seek table) and LAME tag (music
+    length, CRC) are updated.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self._data = f.read()
+
+        self.tag_size = ID3HeaderReader(self.path).tag_size
+        self.frames: List[Mp3Frame] = []
+        # Frame Xing/Info (sans audio), exclue de `frames`
+        self.xing: Optional[Mp3Frame] = None
+        self._xing_offset = 0  # position de "Xing"/"Info" dans la frame
+        self._end = self.tag_size  # fin de la dernière frame
+        self._parse()
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds of audio frames"""
+        return sum(f.samples / f.sample_rate for f in self.frames)
+
+    def cut(
+        self, intervals: List[Tuple[float, float]], output_path: Union[str, Path]
+    ) -> float:
+        """
+        Write file without frames fully inside `intervals` (seconds) to
+        `output_path`, return removed duration in seconds.
+        """
+        keep = self._keep_mask(intervals)
+        kept = [f for f, k in zip(self.frames, keep) if k]
+        removed = sum(
+            f.samples / f.sample_rate for f, k in zip(self.frames, keep) if not k
+        )
+
+        with open(output_path, "wb") as out:
+            out.write(self._data[: self.tag_size])
+            if self.xing:
+                out.write(self._xing_frame(kept))
+            for frame in kept:
+                out.write(self._data[frame.offset : frame.offset + frame.size])
+            out.write(self._data[self._end :])
+
+        return removed
+
+    def _keep_mask(self, intervals: List[Tuple[float, float]]) -> List[bool]:
+        keep: List[bool] = []
+        intervals = sorted(intervals)
+        index = 0
+        time = 0.0
+
+        for frame in self.frames:
+            end = time + frame.samples / frame.sample_rate
+            while index < len(intervals) and intervals[index][1] < end:
+                index += 1
+            inside = index < len(intervals) and intervals[index][0] <= time
+            keep.append(not inside)
+            time = end
+
+        # Bit reservoir : la première frame gardée après une coupure lit ses
+        # données dans les frames précédentes, qui sont gardées elles aussi
+        # (plus une, décodée sans réservoir, donc sacrifiée : du silence)
+        for i in range(1, len(keep)):
+            if not keep[i] or keep[i - 1]:
+                continue
+            needed = self.frames[i].main_data_begin
+            j = i - 1
+            while j >= 0 and not keep[j] and needed > 0:
+                keep[j] = True
+                needed -= self.frames[j].main_data_size
+                j -= 1
+            if j >= 0 and not keep[j] and self.frames[i].main_data_begin:
+                keep[j] = True
+
+        return keep
+
+    def _xing_frame(self, kept: List[Mp3Frame]) -> bytes:
+        """Xing/Info frame with frame count, size, seek table and LAME tag of `kept`"""
+        assert self.xing is not None
+        frame = bytearray(
+            self._data[self.xing.offset : self.xing.offset + self.xing.size]
+        )
+        position = self._xing_offset + 4
+        flags = struct.unpack(">I", frame[position : position + 4])[0]
+        position += 4
+        total_bytes = self.xing.size + sum(f.size for f in kept)
+
+        if flags & 0x1:
+            frame[position : position + 4] = struct.pack(">I", len(kept))
+            position += 4
+        if flags & 0x2:
+            frame[position : position + 4] = struct.pack(">I", total_bytes)
+            position += 4
+        if flags & 0x4:
+            frame[position : position + 100] = self._seek_table(kept, total_bytes)
+            position += 100
+        if flags & 0x8:
+            position += 4  # qualité
+
+        if (
+            frame[position : position + 4] in _LAME_ENCODERS
+            and len(frame) >= position + _LAME_SIZE
+        ):
+            self._update_lame_tag(frame, position, total_bytes)
+
+        return bytes(frame)
+
+    @staticmethod
+    def _update_lame_tag(frame: bytearray, position: int, total_bytes: int) -> None:
+        """LAME tag at `position`: music length and CRC of the tag"""
+        frame[position + 28 : position + 32] = struct.pack(">I", total_bytes)
+        # CRC de la musique : la recalculer relirait tout l'audio en Python,
+        # remis à zéro plutôt que laissé faux
+        frame[position + 32 : position + 34] = b"\x00\x00"
+        # CRC du tag : tous les octets de la frame qui le précèdent
+        crc_position = position + 34
+        frame[crc_position : crc_position + 2] = struct.pack(
+            ">H", _crc16(bytes(frame[:crc_position]))
+        )
+
+    def _seek_table(self, kept: List[Mp3Frame], total_bytes: int) -> bytes:
+        """Xing TOC: byte position (/256) at each percent of duration"""
+        duration = sum(f.samples / f.sample_rate for f in kept) or 1.0
+        table = bytearray(100)
+        position = self.xing.size if self.xing else 0
+        time = 0.0
+        percent = 0
+        for frame in kept:
+            while percent < 100 and time >= duration * percent / 100:
+                table[percent] = min(255, position * 256 // total_bytes)
+                percent += 1
+            position += frame.size
+            time += frame.samples / frame.sample_rate
+        while percent < 100:
+            table[percent] = min(255, position * 256 // total_bytes)
+            percent += 1
+        return bytes(table)
+
+    def _parse(self) -> None:
+        data = self._data
+        offset = self.tag_size
+        size = len(data)
+
+        while offset + 4 <= size:
+            frame = self._read_frame(offset)
+            if frame is None:
+                # Données en fin de fichier (ID3v1, APE) ou resynchronisation
+                if data[offset : offset + 3] in (b"TAG", b"APE"):
+                    break
+                next_offset = self._resync(offset + 1)
+                if next_offset is None:
+                    break
+                offset = next_offset
+                continue
+
+            if not self.frames and self.xing is None and self._is_xing(frame):
+                self.xing = frame
+            else:
+                self.frames.append(frame)
+            offset += frame.size
+            self._end = offset
+
+    def _resync(self, offset: int) -> Optional[int]:
+        data = self._data
+        while True:
+            offset = data.find(b"\xff", offset)
+            if offset < 0 or offset + 4 > len(data):
+                return None
+            frame = self._read_frame(offset)
+            # Deux frames valides de suite : pas un faux synchronisme
+            if frame and self._read_frame(offset + frame.size):
+                return offset
+            offset += 1
+
+    def _read_frame(self, offset: int) -> Optional[Mp3Frame]:
+        header = self._data[offset : offset + 4]
+        if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+            return None
+
+        version = (header[1] >> 3) & 0x3  # 0: MPEG 2.5, 2: MPEG 2, 3: MPEG 1
+        layer = (header[1] >> 1) & 0x3  # 1: Layer III
+        bitrate_index = header[2] >> 4
+        sample_rate_index = (header[2] >> 2) & 0x3
+        if (
+            version == 1
+            or layer != 1
+            or bitrate_index in (0, 15)
+            or sample_rate_index == 3
+        ):
+            return None
+
+        mpeg1 = version == 3
+        crc = 2 if not header[1] & 0x1 else 0
+        padding = (header[2] >> 1) & 0x1
+        mono = header[3] >> 6 == 3
+        bitrate = (_BITRATES_V1 if mpeg1 else _BITRATES_V2)[bitrate_index] * 1000
+        # MPEG 2 : fréquence / 2, MPEG 2.5 : fréquence / 4
+        sample_rate = _SAMPLE_RATES[sample_rate_index] >> {3: 0, 2: 1, 0: 2}[version]
+        samples = 1152 if mpeg1 else 576
+        frame_size = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+        side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+
+        side = self._data[offset + 4 + crc : offset + 6 + crc]
+        if len(side) < 2:
+            return None
+        main_data_begin = ((side[0] << 1) | (side[1] >> 7)) if mpeg1 else side[0]
+
+        return Mp3Frame(
+            offset,
+            frame_size,
+            samples,
+            sample_rate,
+            main_data_begin,
+            frame_size - 4 - crc - side_info,
+        )
+
+    def _is_xing(self, frame: Mp3Frame) -> bool:
+        header = self._data[frame.offset : frame.offset + 4]
+        mpeg1 = (header[1] >> 3) & 0x3 == 3
+        mono = header[3] >> 6 == 3
+        crc = 2 if not header[1] & 0x1 else 0
+        side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+        position = frame.offset + 4 + crc + side_info
+        if self._data[position : position + 4] in (b"Xing", b"Info"):
+            self._xing_offset = position - frame.offset
+            return True
+        return False
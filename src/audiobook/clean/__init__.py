@@ -1,6 +1,13 @@
+from .clean_manifest import CleanManifest
+from .clean_marker import CleanMarker
 from .clean_silences import CleanSilences
-
+from .silence_analyzer import SilenceAnalyzer
+from .silence_map import SilenceMap
 
 __all__ = [
+    "CleanManifest",
+    "CleanMarker",
     "CleanSilences",
+    "SilenceAnalyzer",
+    "SilenceMap",
 ]
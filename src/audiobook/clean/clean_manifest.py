@@ -0,0 +1,56 @@
+"""Manifest of MP3 files left unchanged by a cleaning"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+
+class CleanManifest:
+    """
+    Manifest of MP3 files left unchanged by a cleaning (nothing to cut),
+    stored as `.clean.json` into the MP3 directory: audio hash -> cleaning
+    parameters. Those files are skipped by the next cleaning with the same
+    parameters, without writing a marker into the sources.
+    """
+
+    FILENAME: str = ".clean.json"
+
+    def __init__(self, directory: Path):
+        self.path = directory / self.FILENAME
+        self._entries: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._changed = False
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                # Manifeste illisible : les fichiers seront analysés à nouveau
+                self._entries = {}
+
+    def is_unchanged(self, audio_hash: str, params: str) -> bool:
+        """Audio `audio_hash` was already left unchanged by a cleaning with `params`"""
+        return params in self._entries.get(audio_hash, [])
+
+    def record(self, audio_hash: str, params: str) -> None:
+        """Record audio left unchanged by a cleaning with `params` (thread safe)"""
+        with self._lock:
+            params_list = self._entries.setdefault(audio_hash, [])
+            if params not in params_list:
+                params_list.append(params)
+                self._changed = True
+
+    def save(self) -> None:
+        """Write `.clean.json`, once at the end of a cleaning"""
+        with self._lock:
+            if not self._changed:
+                return
+            # Écriture atomique : un crash ne laisse jamais un manifeste tronqué
+            tmp_path = self.path.with_name(f"{self.FILENAME}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._changed = False
@@ -0,0 +1,60 @@
+"""TXXX marker stamped on MP3 files already cleaned"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Optional, Union
+from mutagen.id3 import ID3, TXXX, ID3NoHeaderError, Encoding
+from audiobook.audio import ID3HeaderReader
+
+
+@dataclass
+class CleanMarker:
+    """
+    TXXX marker stamped on MP3 files rewritten by a cleaning: cleaning
+    parameters and hash of the audio data written. A file whose marker
+    matches the current parameters and its own audio is skipped by
+    `CleanSilences` (files left unchanged are in `CleanManifest`).
+    """
+
+    DESCRIPTION: ClassVar[str] = "AUDIOBOOK_CLEAN"
+
+    params: str
+    audio_hash: str
+
+    @property
+    def text(self) -> str:
+        """TXXX value"""
+        return f"{self.params};sha256={self.audio_hash}"
+
+    @classmethod
+    def for_file(cls, path: Union[str, Path], params: str) -> "CleanMarker":
+        """Marker of `path` current audio data"""
+        return cls(params, ID3HeaderReader(path).audio_hash().hex())
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> Optional["CleanMarker"]:
+        """Marker stamped on `path`, `None` if file was never cleaned"""
+        tags = ID3HeaderReader(path).tags()
+        if tags is None:
+            return None
+        frames = tags.getall(f"TXXX:{cls.DESCRIPTION}")
+        if not frames or not frames[0].text:
+            return None
+
+        params, _, audio_hash = str(frames[0].text[0]).rpartition(";sha256=")
+        return cls(params, audio_hash) if params else None
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Stamp marker on `path`, other tags are kept"""
+        try:
+            tags = ID3(str(path))
+        except ID3NoHeaderError:
+            tags = ID3()
+
+        tags.setall(
+            f"TXXX:{self.DESCRIPTION}",
+            [TXXX(encoding=Encoding.UTF8, desc=self.DESCRIPTION, text=[self.text])],
+        )
+        # Version d'origine conservée (ID3v2.3 pour `extract`)
+        version = 3 if tags.version[:2] == (2, 3) else 4
+        tags.save(str(path), v2_version=version)
@@ -1,58 +1,353 @@
 """Cut silences and clean MP3 files"""
 
+import csv
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
 import audiobook.utils as utils
+from audiobook.audio import ID3HeaderReader, Mp3FrameCutter
+from .clean_manifest import CleanManifest
+from .clean_marker import CleanMarker
+from .silence_analyzer import SilenceAnalyzer
+from .silence_map import SilenceMap
 
 
 class CleanSilences:
     """Cut silences and clean MP3 files"""
 
-    def __init__(self, mp3_directory: str):
+    # Silence gardé de chaque côté d'une coupure sans ré-encodage (ms)
+    KEEP_SILENCE_MS: int = 250
+
+    def __init__(
+        self, mp3_directory: str, max_workers: Optional[int] = None, force: bool = False
+    ):
         """
-        :param file_paths: Liste des chemins vers les fichiers .mp3
+        :param mp3_directory: Dossier des fichiers .mp3
+        :param max_workers: Nombre de fichiers traités en parallèle (CPU par défaut)
+        :param force: Nettoie aussi les fichiers déjà marqués avec les mêmes paramètres
         """
 
         print("Cut silences...")
         self.mp3_list = utils.get_files(mp3_directory, "mp3")
         self.file_paths: List[Path] = [Path(p) for p in self.mp3_list]
-        # On garde trace des paires (original, temporaire) pour le remplacement final
-        self._processed_files: List[Tuple[Path, Path]] = []
+        # Un encodage libmp3lame n'utilise qu'un coeur : un fichier par coeur
+        self.max_workers: int = max_workers or (os.cpu_count() or 4)
+        # Fichiers remplacés par leur version clean
+        self._processed_files: List[Path] = []
+        self._failed_files: List[Tuple[Path, str]] = []
+        self._unchanged_files: List[Path] = []
+        # Fichiers déjà nettoyés avec les mêmes paramètres (`CleanMarker`)
+        # ou déjà laissés inchangés (`CleanManifest`)
+        self._skipped_files: List[Path] = []
+        self.force = force
+        self._manifest = CleanManifest(Path(mp3_directory))
+        self._analyzer = SilenceAnalyzer()
+        # Cartes des silences déjà analysées, réutilisées par le nettoyage
+        self._silence_maps: Dict[Path, SilenceMap] = {}
 
-    def remove_silences(
+    def analyze(
         self, min_silence_len: int = 2000, silence_thresh: int = -40
+    ) -> List[SilenceMap]:
+        """
+        Analyse seule (aucun fichier modifié) : carte des silences de chaque
+        fichier, en parallèle, dans l'ordre des fichiers.
+        """
+        print("\n--- Analyse des silences ---")
+        total = len(self.file_paths)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                lambda p: self._detect_silences(p, min_silence_len, silence_thresh),
+                self.file_paths,
+            )
+            maps: List[SilenceMap] = []
+            for done, (path, silences) in enumerate(zip(self.file_paths, results), 1):
+                maps.append(silences)
+                keep = self.KEEP_SILENCE_MS / 1000.0
+                removable = silences.removable_duration(keep)
+                print(
+                    f"  🔍 [{done}/{total}] {path.name} : "
+                    f"{len(silences.intervals)} silence(s), {removable:.1f}s"
+                )
+
+        return maps
+
+    def write_report(self, report_path: str) -> None:
+        """
+        Rapport des silences analysés, JSON ou CSV selon l'extension :
+        intervalles, durée retirable et gain estimé par fichier.
+        """
+        keep = self.KEEP_SILENCE_MS / 1000.0
+        rows: List[Dict[str, Any]] = []
+        for path in self.file_paths:
+            silences = self._silence_maps.get(path)
+            if silences is None:
+                continue
+            removable = silences.removable_duration(keep)
+            size = path.stat().st_size
+            rows.append(
+                {
+                    "file": path.name,
+                    "duration": round(silences.duration, 3),
+                    "silences": len(silences.intervals),
+                    "intervals": [
+                        [round(start, 3), round(end, 3)]
+                        for start, end in silences.intervals
+                    ],
+                    "removable": round(removable, 3),
+                    # Débit constant supposé : taille au prorata de la durée
+                    "estimated_savings": (
+                        int(size * removable / silences.duration)
+                        if silences.duration
+                        else 0
+                    ),
+                }
+            )
+
+        if report_path.lower().endswith(".csv"):
+            with open(report_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+                writer.writeheader()
+                for row in rows:
+                    row["intervals"] = " ".join(f"{s}-{e}" for s, e in row["intervals"])
+                    writer.writerow(row)
+        else:
+            first = next(iter(self._silence_maps.values()), None)
+            report = {
+                "min_silence_len": first.min_silence_len if first else None,
+                "silence_thresh": first.silence_thresh if first else None,
+                "files_to_clean": sum(1 for r in rows if r["removable"] > 0),
+                "removable": round(sum(r["removable"] for r in rows), 3),
+                "estimated_savings": sum(r["estimated_savings"] for r in rows),
+                "files": rows,
+            }
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+
+        removable_total = sum(r["removable"] for r in rows)
+        savings = sum(r["estimated_savings"] for r in rows)
+        print(
+            f"📝 Rapport : {report_path} ({utils.format_duration(removable_total)} "
+            f"retirables, ~{utils.size_human_readable(savings)})"
+        )
+
+    def remove_silences(
+        self,
+        min_silence_len: int = 2000,
+        silence_thresh: int = -40,
+        lossless: bool = False,
     ) -> None:
-        """Crée des fichiers _clean.mp3 pour chaque original."""
+        """
+        Nettoie les fichiers en parallèle, chaque original est remplacé
+        (atomiquement) par sa version clean dès qu'elle est terminée.
+
+        :param lossless: Détecte les silences puis copie les frames MP3 hors
+            silences, sans ré-encodage (fichiers sans silence inchangés)
+        """
         print("\n--- Analyse et retrait des silences ---")
-        self._processed_files = []  # Reset de la liste de suivi
+        mode = "lossless" if lossless else "reencode"
+        self._run(
+            lambda path: self._clean_file(
+                path, min_silence_len, silence_thresh, lossless
+            ),
+            f"{mode} min_silence_len={min_silence_len} silence_thresh={silence_thresh}",
+        )
 
-        for path in self.file_paths:
-            clean_path = path.with_name(f"{path.stem}_clean.mp3")
+    def trim_boundaries(
+        self,
+        boundary: float = 30.0,
+        min_silence_len: int = 2000,
+        silence_thresh: int = -40,
+    ) -> None:
+        """
+        Retire seulement les silences de début et de fin de chaque fichier :
+        seules les `boundary` premières et dernières secondes sont décodées,
+        la coupe copie les frames MP3 (aucun ré-encodage).
+        """
+        print("\n--- Retrait des silences de début et de fin ---")
+        self._run(
+            lambda path: self._trim_file(
+                path, boundary, min_silence_len, silence_thresh
+            ),
+            f"trim={boundary} min_silence_len={min_silence_len} "
+            f"silence_thresh={silence_thresh}",
+        )
 
-            success = self._cut_silence_logic(
-                path, clean_path, min_silence_len, silence_thresh
-            )
+    def _run(self, task: Callable[[Path], bool], params: str) -> None:
+        """
+        Applique `task` à chaque fichier en parallèle, avec suivi. Les
+        fichiers déjà traités avec `params` (audio inchangé depuis) sont ignorés.
+        """
+        self._processed_files = []  # Reset de la liste de suivi
+        self._failed_files = []
+        self._unchanged_files = []
+        self._skipped_files = []
+        total = len(self.file_paths)
 
-            if success:
-                self._processed_files.append((path, clean_path))
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self._process_file, task, path, params): path
+                    for path in self.file_paths
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    path = futures[future]
+                    try:
+                        changed = future.result()
+                        if changed is None:
+                            self._skipped_files.append(path)
+                            print(f"  ⏭️ [{done}/{total}] {path.name} : déjà nettoyé")
+                        elif changed:
+                            self._processed_files.append(path)
+                            print(f"  ✅ [{done}/{total}] {path.name}")
+                        else:
+                            self._unchanged_files.append(path)
+                            print(f"  ➖ [{done}/{total}] {path.name} : aucun silence")
+                    except Exception as e:
+                        self._failed_files.append((path, str(e)))
+                        print(f"  × [{done}/{total}] {path.name} : {e}")
+        finally:
+            # Un seul `.clean.json` écrit, même après une erreur
+            self._manifest.save()
 
     def finalize(self) -> None:
-        """Remplace les fichiers originaux par les versions clean et nettoie."""
-        if not self._processed_files:
+        """Résumé : les originaux sont déjà remplacés par `remove_silences`."""
+        if self._skipped_files:
+            print(f"⏭️ {len(self._skipped_files)} fichier(s) déjà nettoyé(s)")
+        if not self._processed_files and not self._failed_files:
             print("Aucun fichier à remplacer.")
             return
 
-        print("\n--- Finalisation : Remplacement des originaux ---")
-        for original, clean in self._processed_files:
-            try:
-                # On supprime l'original et on renomme le clean
-                original.unlink()
-                clean.rename(original)
-                print(f"✓ Mis à jour : {original.name}")
-            except Exception as e:
-                print(f"× Erreur lors du remplacement de {original.name} : {e}")
+        print("\n--- Finalisation ---")
+        print(f"✓ {len(self._processed_files)} fichier(s) mis à jour")
+        if self._unchanged_files:
+            print(f"➖ {len(self._unchanged_files)} fichier(s) sans silence à couper")
+        for original, error in self._failed_files:
+            print(f"× Erreur sur {original.name} (original conservé) : {error}")
+
+    def _process_file(
+        self, task: Callable[[Path], bool], path: Path, params: str
+    ) -> Optional[bool]:
+        """
+        `task` sur un fichier pas encore traité avec `params`, retourne
+        `None` si le fichier est ignoré.
+        """
+        audio_hash = ID3HeaderReader(path).audio_hash().hex()
+        if not self.force and (
+            CleanMarker.read(path) == CleanMarker(params, audio_hash)
+            or self._manifest.is_unchanged(audio_hash, params)
+        ):
+            return None
+
+        changed = task(path)
+        if changed:
+            # Seuls les fichiers réécrits sont marqués
+            CleanMarker.for_file(path, params).write(path)
+        else:
+            # Source inchangée : notée à part, aucun tag réécrit
+            self._manifest.record(audio_hash, params)
+        return changed
+
+    def _clean_file(
+        self, path: Path, min_silence_len: int, silence_thresh: int, lossless: bool
+    ) -> bool:
+        """
+        Crée la version clean à côté de l'original puis la met en place,
+        retourne `False` si le fichier est inchangé.
+        """
+        # Nom caché sans extension .mp3 : jamais listé comme source
+        clean_path = path.with_name(f".{path.stem}.clean.part")
+
+        try:
+            if lossless:
+                if not self._cut_silence_lossless(
+                    path, clean_path, min_silence_len, silence_thresh
+                ):
+                    return False
+            else:
+                # Analyse peu coûteuse : pas d'encodage si aucun silence
+                silences = self._detect_silences(path, min_silence_len, silence_thresh)
+                if not silences.intervals:
+                    return False
+                self._cut_silence_logic(
+                    path, clean_path, min_silence_len, silence_thresh
+                )
+            # `os.replace` est atomique : l'original ou le clean, jamais un mélange
+            os.replace(clean_path, path)
+            return True
+        finally:
+            clean_path.unlink(missing_ok=True)
+
+    def _trim_file(
+        self, path: Path, boundary: float, min_silence_len: int, silence_thresh: int
+    ) -> bool:
+        """
+        Coupe les silences de début et de fin par copie des frames,
+        retourne `False` si le fichier est inchangé.
+        """
+        # Durée lue dans l'en-tête (Xing/Info ou débit), sans lire le fichier
+        duration = ID3HeaderReader(path).info().length
+        silences = self._analyzer.analyze_boundaries(
+            path, duration, boundary, min_silence_len, silence_thresh
+        )
+        self._silence_maps[path] = silences
+
+        # Silence gardé seulement côté audio, les bords du fichier sont coupés
+        keep = self.KEEP_SILENCE_MS / 1000.0
+        intervals = []
+        for start, end in silences.intervals:
+            if start == 0 and end - keep > 0:
+                intervals.append((0.0, end - keep))
+            elif start > 0 and start + keep < end:
+                intervals.append((start + keep, float("inf")))
+        if not intervals:
+            return False
+
+        clean_path = path.with_name(f".{path.stem}.clean.part")
+        try:
+            # Fichier lu en entier seulement s'il y a des frames à retirer
+            if Mp3FrameCutter(path).cut(intervals, clean_path) <= 0:
+                return False
+            os.replace(clean_path, path)
+            return True
+        finally:
+            clean_path.unlink(missing_ok=True)
+
+    def _detect_silences(
+        self, path: Path, min_silence_len: int, silence_thresh: int
+    ) -> SilenceMap:
+        """Carte des silences, analysée en NumPy sur le PCM décodé (une fois)."""
+        silences = self._silence_maps.get(path)
+        if (
+            silences is None
+            or silences.min_silence_len != min_silence_len
+            or silences.silence_thresh != silence_thresh
+        ):
+            silences = self._analyzer.analyze(path, min_silence_len, silence_thresh)
+            self._silence_maps[path] = silences
+        return silences
+
+    def _cut_silence_lossless(
+        self,
+        chemin_entree: Path,
+        chemin_sortie: Path,
+        min_silence_len: int,
+        silence_thresh: int,
+    ) -> bool:
+        """
+        Coupe les silences en copiant les frames MP3 (aucun ré-encodage),
+        retourne `False` si aucun silence n'est à couper.
+        """
+        silences = self._detect_silences(chemin_entree, min_silence_len, silence_thresh)
+        intervals = silences.removable(self.KEEP_SILENCE_MS / 1000.0)
+        if not intervals:
+            return False
+
+        removed = Mp3FrameCutter(chemin_entree).cut(intervals, chemin_sortie)
+        return removed > 0
 
     def _get_bitrate(self, path: Path) -> str:
         """Extrait le bitrate du fichier original."""
@@ -85,9 +380,9 @@ class CleanSilences:
         chemin_sortie: Path,
         min_silence_len: int,
         silence_thresh: int,
-    ) -> bool:
+    ) -> None:
+        """Encode `chemin_entree` sans ses silences, lève une erreur en cas d'échec."""
         try:
-            print(f"Handle {chemin_entree}")
             duration_secs = min_silence_len / 1000.0
 
             # 1. On récupère le bitrate de l'original
@@ -113,17 +408,18 @@ class CleanSilences:
                 original_bitrate,  # On force le bitrate identique
                 "-map_metadata",
                 "0",  # On préserve les tags (Artiste, Album...)
+                "-f",
+                "mp3",  # Fichier temporaire sans extension .mp3
                 str(chemin_sortie),
             ]
 
             subprocess.run(
                 command,
                 check=True,
+                stdin=subprocess.DEVNULL,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-            return True
 
         except subprocess.CalledProcessError as e:
-            print(f"Erreur sur {chemin_entree.name} : code {e.returncode}")
-            return False
+            raise RuntimeError(f"FFmpeg code {e.returncode}") from e
@@ -0,0 +1,171 @@
+"""Detect silences from decoded PCM with NumPy"""
+
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import numpy as np
+from .silence_map import SilenceMap
+
+
+class SilenceAnalyzer:
+    """
+    Detect silences from decoded PCM with NumPy.
+
+    One ffmpeg decode streams mono 16-bit PCM at a low sample rate, read by
+    blocks. RMS level (dBFS) is computed for fixed windows with vectorised
+    operations, then runs of silent windows longer than `min_silence_len`
+    become the intervals of a `SilenceMap`.
+    """
+
+    SAMPLE_RATE: int = 8000
+    WINDOW_MS: int = 50
+    BLOCK_WINDOWS: int = 4096  # fenêtres lues par bloc
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, window_ms: int = WINDOW_MS):
+        self.sample_rate = sample_rate
+        self.window = sample_rate * window_ms // 1000  # échantillons par fenêtre
+
+    def analyze(
+        self,
+        path: Union[str, Path],
+        min_silence_len: int = 2000,
+        silence_thresh: int = -40,
+    ) -> SilenceMap:
+        """Silence map of `path`, same parameters as `CleanSilences`"""
+        levels = self.levels(path)
+        silent = levels < silence_thresh
+        window_seconds = self.window / self.sample_rate
+
+        return SilenceMap(
+            str(path),
+            len(levels) * window_seconds,
+            min_silence_len,
+            silence_thresh,
+            self._runs(silent, min_silence_len / 1000.0, window_seconds),
+        )
+
+    def analyze_boundaries(
+        self,
+        path: Union[str, Path],
+        duration: float,
+        boundary: float,
+        min_silence_len: int = 2000,
+        silence_thresh: int = -40,
+    ) -> SilenceMap:
+        """
+        Silence map of leading and trailing silences only: just the first and
+        last `boundary` seconds are decoded (input seeking), `duration` is
+        the duration of `path` in seconds
+        """
+        if duration <= 2 * boundary:
+            silences = self.analyze(path, min_silence_len, silence_thresh)
+            silences.intervals = [
+                (start, end)
+                for start, end in silences.intervals
+                if start == 0 or end >= silences.duration
+            ]
+            return silences
+
+        window_seconds = self.window / self.sample_rate
+        min_duration = min_silence_len / 1000.0
+        intervals: List[Tuple[float, float]] = []
+
+        head = self._runs(
+            self.levels(path, 0, boundary) < silence_thresh, 0, window_seconds
+        )
+        if head and head[0][0] == 0 and head[0][1] - head[0][0] >= min_duration:
+            intervals.append(head[0])
+
+        tail_start = duration - boundary
+        tail_levels = self.levels(path, tail_start, boundary)
+        tail = self._runs(tail_levels < silence_thresh, 0, window_seconds)
+        tail_end = len(tail_levels) * window_seconds
+        if (
+            tail
+            and tail[-1][1] >= tail_end
+            and tail[-1][1] - tail[-1][0] >= min_duration
+        ):
+            intervals.append((tail_start + tail[-1][0], duration))
+
+        return SilenceMap(
+            str(path), duration, min_silence_len, silence_thresh, intervals
+        )
+
+    def levels(
+        self,
+        path: Union[str, Path],
+        start: Optional[float] = None,
+        duration: Optional[float] = None,
+    ) -> np.ndarray:
+        """RMS level (dBFS) of each window of `path`, or of a part of it"""
+        # Seek au niveau de l'entrée : seule la partie demandée est décodée
+        seek: List[str] = []
+        if start is not None:
+            seek.extend(["-ss", str(start)])
+        if duration is not None:
+            seek.extend(["-t", str(duration)])
+
+        command = [
+            "ffmpeg",
+            "-v",
+            "error",
+            *seek,
+            "-i",
+            str(path),
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(self.sample_rate),
+            "-f",
+            "s16le",
+            "-",
+        ]
+        block_size = self.window * self.BLOCK_WINDOWS * 2  # int16 : 2 octets
+        blocks: List[np.ndarray] = []
+        rest = b""
+
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stdin=subprocess.DEVNULL
+        ) as process:
+            assert process.stdout is not None
+            while True:
+                chunk = process.stdout.read(block_size)
+                if not chunk:
+                    break
+                data = rest + chunk
+                usable = len(data) - len(data) % (self.window * 2)
+                rest = data[usable:]
+                if usable:
+                    blocks.append(self._block_levels(data[:usable]))
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        if rest:
+            # Dernière fenêtre incomplète : complétée par du silence
+            padded = rest + b"\x00" * (self.window * 2 - len(rest))
+            blocks.append(self._block_levels(padded))
+
+        return np.concatenate(blocks) if blocks else np.zeros(0)
+
+    def _block_levels(self, data: bytes) -> np.ndarray:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        windows = samples.reshape(-1, self.window)
+        rms = np.sqrt(np.mean(np.square(windows), axis=1))
+        # Plancher pour éviter log10(0) sur du silence numérique
+        return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+    @staticmethod
+    def _runs(
+        silent: np.ndarray, min_duration: float, window_seconds: float
+    ) -> List[Tuple[float, float]]:
+        """Runs of `True` windows at least `min_duration` long, in seconds"""
+        edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        long_enough = (ends - starts) * window_seconds >= min_duration
+
+        return [
+            (float(start * window_seconds), float(end * window_seconds))
+            for start, end in zip(starts[long_enough], ends[long_enough])
+        ]
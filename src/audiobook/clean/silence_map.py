@@ -0,0 +1,27 @@
+"""Silent intervals found into an audio file"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+@dataclass
+class SilenceMap:
+    """Silent intervals (seconds) found into an audio file"""
+
+    path: str
+    duration: float
+    min_silence_len: int  # ms
+    silence_thresh: int  # dBFS
+    intervals: List[Tuple[float, float]] = field(default_factory=list)
+
+    def removable(self, keep: float = 0.0) -> List[Tuple[float, float]]:
+        """Intervals to cut, `keep` seconds of silence kept on each side"""
+        return [
+            (start + keep, end - keep)
+            for start, end in self.intervals
+            if end - start > 2 * keep
+        ]
+
+    def removable_duration(self, keep: float = 0.0) -> float:
+        """Total duration (seconds) of `removable` intervals"""
+        return sum(end - start for start, end in self.removable(keep))
@@ -1,7 +1,9 @@
 """build command of audiobook-tool"""
 
+from pathlib import Path
 from audiobook.args import AudiobookArgs
 from audiobook.m4b import (
+    M4bManifest,
     M4bRenamer,
     M4bSplit,
     M4bChapterEditor,
@@ -18,22 +20,49 @@ class CommandBuild:
     def __init__(self, args: AudiobookArgs):
         # Setup config
         config = ConfigBuild(args)
-        utils.delete_directory(config.m4b_directory_output)
+        manifest = M4bManifest(config)
 
         print(f"Handle {args.mp3_directory}...")
 
-        if args.clear_old_m4b:
+        if not args.clear_old_m4b:
+            print("🔎 Check if MP3 sources changed since last build...")
+            parts = manifest.find_parts()
+            if parts:
+                self._update_metadata_only(config, parts)
+                utils.alert_sound()
+                return
+
+        utils.delete_directory(config.m4b_directory_output)
+
+        # Source covers are ignored by forge (audio stream only),
+        # MP3 files are only rewritten if explicitly requested
+        if args.strip_covers:
             print("🖼️ Remove MP3 files source covers...")
-            config.remove_covers()
+            count = config.remove_covers()
+            print(f"  🖼️ {count}/{len(config.mp3_list)} MP3 files had a cover")
 
         print("🔨 Forge M4B...")
-        forge = AudiobookForge(config.mp3_directory, args.clear_old_m4b)
+        forge = AudiobookForge(
+            config.mp3_directory, args.clear_old_m4b, config.encode_options
+        )
+        # Forge skips an existing M4B: one forged from other sources
+        # (or filters) is removed, so it is forged again and not split
+        if utils.file_exists(forge.m4b_file) and not manifest.is_built_from_sources(
+            forge.m4b_file
+        ):
+            print("♻️ MP3 sources changed, remove previous forged M4B...")
+            utils.delete_file(forge.m4b_file)
+        forged = not utils.file_exists(forge.m4b_file)
+
         if args.use_rust:
             print("Use audiobook-forge crate")
             forge = forge.build_rust()
         else:
             forge = forge.build_native()
         print(f"\n📦 M4B: `{forge.m4b_file}` ({forge.size})\n")
+        # Only a M4B forged by this build is stamped with the current digest
+        if forged and utils.file_exists(forge.m4b_file):
+            manifest.stamp(forge.m4b_file)
 
         # Set audiobook-forge M4B output
         config.set_m4b_forge_path(forge.m4b_file)
@@ -49,6 +78,7 @@ class CommandBuild:
         config.m4b_split_paths = split.m4b_split_paths
 
         print("🔖 Update tags with metadata.yml...")
+        config.source_digest = manifest.digest
         M4bTagger(config).run()
 
         print("📐 Rename M4B splitted...")
@@ -61,3 +91,23 @@ class CommandBuild:
         config.temporary_directory_delete()
 
         utils.alert_sound()
+
+    def _update_metadata_only(self, config: ConfigBuild, parts: list[str]):
+        """MP3 sources unchanged: update tags and cover of existing M4B parts"""
+        print("♻️ MP3 sources unchanged, only update tags and cover...")
+        config.m4b_split_paths = parts
+
+        print("🔖 Update tags with metadata.yml...")
+        M4bTagger(config).run()
+
+        print("📐 Rename M4B parts...")
+        config.m4b_split_paths = M4bRenamer(config).run()
+
+        # Title changed: parts are into directory of previous title
+        parts_directory = Path(parts[0]).parent
+        if parts_directory != Path(config.m4b_directory_output).resolve():
+            utils.move_files(config.m4b_split_paths, config.m4b_directory_output)
+            if not any(parts_directory.iterdir()):
+                utils.delete_directory(parts_directory)
+
+        config.temporary_directory_delete()
@@ -14,8 +14,23 @@ class CommandClean:
 
         # CleanCovers(mp3_directory).remove_covers()
 
-        clean = CleanSilences(mp3_directory)
-        clean.remove_silences()
-        clean.finalize()
+        clean = CleanSilences(
+            mp3_directory, max_workers=args.jobs, force=args.clean_force
+        )
+        if args.clean_dry_run:
+            clean.analyze()
+            clean.write_report(
+                args.clean_report or utils.path_join(mp3_directory, "clean_report.json")
+            )
+        elif args.clean_trim is not None:
+            clean.trim_boundaries(args.clean_trim)
+            clean.finalize()
+            if args.clean_report:
+                clean.write_report(args.clean_report)
+        else:
+            clean.remove_silences(lossless=args.clean_lossless)
+            clean.finalize()
+            if args.clean_report:
+                clean.write_report(args.clean_report)
 
         utils.alert_sound()
@@ -3,7 +3,7 @@
 from audiobook.args import AudiobookArgs
 import audiobook.utils as utils
 from audiobook.audio import AudioMetadataManager
-from audiobook.extract import Extractor
+from audiobook.extract import Extractor, ExtractSelection
 
 
 class CommandExtract:
@@ -13,7 +13,19 @@ class CommandExtract:
         print(args.m4b_directory)
 
         try:
-            converter = Extractor(str(args.m4b_directory))
+            selection = ExtractSelection.parse(
+                args.extract_chapters,
+                args.extract_title,
+                args.extract_from,
+                args.extract_to,
+            )
+            converter = Extractor(
+                str(args.m4b_directory),
+                max_workers=args.jobs,
+                output_format=args.extract_format,
+                selection=selection,
+                force=args.extract_force,
+            )
             converter.convert_and_split()
             print("✅ Conversion terminée !")
         except Exception as e:
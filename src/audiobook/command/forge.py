@@ -11,7 +11,9 @@ class CommandForge:
 
     def __init__(self, args: AudiobookArgs):
         config = ConfigForge(args)
-        forge = AudiobookForge(config.mp3_directory, True).build_native()
+        forge = AudiobookForge(
+            config.mp3_directory, True, config.encode_options
+        ).build_native()
         print(f"\nM4B: `{forge.m4b_file}` ({forge.size})\n")
 
         utils.alert_sound()
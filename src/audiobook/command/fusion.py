@@ -2,6 +2,9 @@
 
 from pathlib import Path
 from audiobook.args import AudiobookArgs
+from audiobook.config import ConfigFusion
+from audiobook.m4b import M4bAppender
+import audiobook.utils as utils
 
 
 class CommandFusion:
@@ -18,3 +21,12 @@ class CommandFusion:
         print("--- Début de la fusion ---")
         print(f"Base : {m4b_directory}")
         print(f"Ajouts : {mp3_directory}")
+
+        config = ConfigFusion(args)
+        try:
+            appender = M4bAppender(config).run()
+            print(f"\n📦 {len(appender.m4b_paths)} part(s) updated")
+        finally:
+            config.temporary_directory_delete()
+
+        utils.alert_sound()
@@ -1,9 +1,11 @@
 from .config_build import ConfigBuild
 from .config_extract import ConfigExtract
 from .config_forge import ConfigForge
+from .config_fusion import ConfigFusion
 
 __all__ = [
     "ConfigBuild",
     "ConfigExtract",
     "ConfigForge",
+    "ConfigFusion",
 ]
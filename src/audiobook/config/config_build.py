@@ -2,9 +2,11 @@
 
 import tempfile
 import os
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from pathlib import Path
 import audiobook.utils as utils
+from audiobook.forge import EncodeOptions
 from ..args import AudiobookArgs
 from ..metadata import MetadataFile
 from ..metadata import MetadataYml
@@ -45,6 +47,15 @@ class ConfigBuild:
 
         # List of MP3 file paths as `list[str]` from `mp3_directory`
         self.mp3_list = utils.get_files(self.mp3_directory, "mp3")
+
+        # Filters applied by forge while encoding MP3 to AAC
+        self.encode_options = EncodeOptions(
+            remove_silences=args.remove_silences, loudness=args.loudnorm
+        )
+        if args.use_rust and not self.encode_options.is_empty:
+            # audiobook-forge can't apply them: not part of the source digest
+            print("⚠️ Encode filters are ignored by audiobook-forge")
+            self.encode_options = EncodeOptions()
         # List of M4B file paths as `list[str]` from `m4b_directory_output`
         self.m4b_list = utils.get_files(self.m4b_directory_output, "m4b")
 
@@ -56,6 +67,8 @@ class ConfigBuild:
             self.m4b_forge_metadata = MetadataFile(self.m4b_forge_path)
 
         self.m4b_split_paths: list[str] = []
+        # Digest of MP3 sources stored into M4B parts (see `M4bManifest`)
+        self.source_digest: Optional[str] = None
 
     def _handle_list_metadata(self, listing: list[str]):
         items: List[MetadataFile] = []
@@ -74,10 +87,16 @@ class ConfigBuild:
         """Delete temporary_directory"""
         self.temporary_directory.cleanup()
 
-    def remove_covers(self):
-        """Remove covers from MP3 files"""
-        for file in self.mp3_metadata:
-            file.remove_cover()
+    def remove_covers(self) -> int:
+        """
+        Remove covers from MP3 files in parallel, files without cover
+        are not rewritten. Return count of rewritten files.
+        """
+        with_cover = [file for file in self.mp3_metadata if file.has_cover()]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(lambda file: file.remove_cover(), with_cover))
+
+        return len(with_cover)
 
     def set_m4b_forge_path(self, m4b_forge_path: str):
         """Set fresh M4B output"""
@@ -107,5 +126,6 @@ class ConfigBuild:
             f"  mp3_metadata:  {len(self.mp3_metadata)}\n"
             f"  m4b_metadata:  {len(self.m4b_metadata)}\n"
             f"  m4b_split_paths:  {len(self.m4b_split_paths)}\n"
+            f"  source_digest:  {self.source_digest}\n"
             f")"
         )
@@ -1,6 +1,7 @@
 """Handle config for forge audiobook-tool"""
 
 import audiobook.utils as utils
+from audiobook.forge import EncodeOptions
 from ..args import AudiobookArgs
 
 
@@ -14,6 +15,11 @@ class ConfigForge:
         # List of MP3 file paths as `list[str]` from `mp3_directory`
         self.mp3_list = utils.get_files(self.mp3_directory, "mp3")
 
+        # Filters applied by forge while encoding MP3 to AAC
+        self.encode_options = EncodeOptions(
+            remove_silences=args.remove_silences, loudness=args.loudnorm
+        )
+
     def __str__(self) -> str:
         return (
             f"ConfigForge(\n"
@@ -0,0 +1,54 @@
+"""Handle config for fusion audiobook-tool"""
+
+import tempfile
+from typing import List
+import audiobook.utils as utils
+from ..args import AudiobookArgs
+from ..metadata import MetadataFile
+
+
+class ConfigFusion:
+    """Handle config for fusion audiobook-tool"""
+
+    def __init__(self, args: AudiobookArgs):
+        # /path/to/audiobook_m4b (multiparts)
+        self.m4b_directory = str(args.m4b_directory)
+        # /path/to/new_chapters_mp3
+        self.mp3_directory = str(args.mp3_directory)
+
+        # List of M4B parts as `list[str]` from `m4b_directory`, in order
+        self.m4b_list = utils.get_files(self.m4b_directory, "m4b")
+        self.m4b_metadata = self._handle_list_metadata(self.m4b_list)
+        # List of new MP3 file paths as `list[str]` from `mp3_directory`
+        self.mp3_list = utils.get_files(self.mp3_directory, "mp3")
+
+        # /var/folders/m0/xhm5c_mx7yn2b8mqtqhdpc840000gn/T/tmppa8g2g_n
+        self.temporary_directory = tempfile.TemporaryDirectory()
+
+    @property
+    def temporary_directory_path(self):
+        """Get temporary_directory"""
+        return self.temporary_directory.name
+
+    def temporary_directory_delete(self):
+        """Delete temporary_directory"""
+        self.temporary_directory.cleanup()
+
+    def _handle_list_metadata(self, listing: list[str]):
+        items: List[MetadataFile] = []
+
+        for media in listing:
+            items.append(MetadataFile(media))
+
+        return items
+
+    def __str__(self) -> str:
+        return (
+            f"ConfigFusion(\n"
+            f"  m4b_directory:  {self.m4b_directory}\n"
+            f"  mp3_directory:  {self.mp3_directory}\n"
+            f"  m4b_list:  {len(self.m4b_list)}\n"
+            f"  mp3_list:  {len(self.mp3_list)}\n"
+            f"  temporary_directory:  {self.temporary_directory.name}\n"
+            f")"
+        )
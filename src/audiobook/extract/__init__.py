@@ -1,5 +1,13 @@
+from .extract_engine import ExtractEngine
+from .extract_manifest import ExtractManifest
+from .extract_segment import ExtractSegment
+from .extract_selection import ExtractSelection
 from .extractor import Extractor
 
 __all__ = [
+    "ExtractEngine",
+    "ExtractManifest",
+    "ExtractSegment",
+    "ExtractSelection",
     "Extractor",
 ]
@@ -0,0 +1,314 @@
+"""Extraction engine: M4B chapters to MP3 (encode) or M4A (stream copy)."""
+
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import audiobook.utils as utils
+from audiobook.metadata import MetadataChapterTable
+from .extract_manifest import ExtractManifest
+from .extract_segment import ExtractSegment
+from .extract_selection import ExtractSelection
+
+
+class ExtractEngine:
+    """
+    Extraction engine behind `Extractor` and `M4BToMP3Splitter`: exact
+    chapter table, input seeking, bounded parallelism, tags (and cover)
+    written at encode time, resumable outputs and one progress output.
+    """
+
+    FORMATS = ("mp3", "m4a")
+    # Padding ID3 réservé à l'encodage (octets)
+    ID3_PADDING: int = 4096
+
+    def __init__(
+        self,
+        m4b_files: List[Path],
+        output_folder: Path,
+        max_workers: Optional[int] = None,
+        output_format: str = "mp3",
+        selection: Optional[ExtractSelection] = None,
+        force: bool = False,
+        with_cover: bool = False,
+        match_bitrate: bool = False,
+        name_pattern: str = "{file:02d}_{chapter:0{width}d}_{title}",
+        full_name_pattern: str = "{file:02d}_Full_Book",
+        untitled_pattern: str = "Chapter_{id}",
+    ):
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Format de sortie non supporté : {output_format}")
+        self.m4b_files = m4b_files
+        self.output_folder = output_folder
+        # Un encodage libmp3lame n'utilise qu'un coeur : un job par coeur
+        self.max_workers: int = max_workers or (os.cpu_count() or 4)
+        self.output_format = output_format
+        self.selection: ExtractSelection = selection or ExtractSelection()
+        # Ré-extrait même les fichiers à jour d'après le manifeste
+        self.force = force
+        # Copie la couverture du M4B dans chaque fichier
+        self.with_cover = with_cover
+        # MP3 au bitrate du M4B plutôt qu'en VBR V2
+        self.match_bitrate = match_bitrate
+        # Noms sans extension : `file` et `chapter` commencent à 1
+        self.name_pattern = name_pattern
+        self.full_name_pattern = full_name_pattern
+        # Titre d'un chapitre sans titre : `id` commence à 0, `chapter` à 1
+        self.untitled_pattern = untitled_pattern
+
+        if not self.output_folder.exists():
+            self.output_folder.mkdir(parents=True)
+
+        self.manifest = ExtractManifest(self.output_folder)
+
+    def probe(self, file_path: Path) -> Dict[str, Any]:
+        """Chapitres, format (tags, bitrate) et flux d'un fichier via ffprobe."""
+        cmd = [
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-print_format",
+            "json",
+            "-show_chapters",
+            "-show_format",
+            "-show_streams",
+            str(file_path),
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+
+    def sanitize_filename(self, filename: str) -> str:
+        """Nettoie le nom de fichier pour éviter les caractères interdits."""
+        return "".join(
+            [c for c in filename if c.isalnum() or c in (" ", ".", "_", "-")]
+        ).strip()
+
+    def run(self) -> List[Path]:
+        """
+        Extrait les segments planifiés en parallèle, les fichiers déjà à jour
+        sont ignorés. Un segment en erreur est signalé sans arrêter les autres.
+        Retourne les fichiers de sortie dans l'ordre du plan (hors erreurs).
+        """
+        print(f"Traitement de {len(self.m4b_files)} fichier(s)...")
+        started = time.perf_counter()
+
+        planned = self.plan_segments()
+        segments = [
+            s
+            for s in planned
+            if self.force or not self.manifest.is_up_to_date(s, self.output_args(s))
+        ]
+        if len(segments) < len(planned):
+            print(
+                f"⏭️ {len(planned) - len(segments)} segment(s) déjà à jour, ignoré(s)"
+            )
+
+        total = len(segments)
+        print(f"🚀 Extraction de {total} segment(s) sur {self.max_workers} workers...")
+
+        written = 0
+        failed: List[str] = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # `map` rend les résultats dans l'ordre du plan : sortie ordonnée
+                results = executor.map(self._try_export_segment, segments)
+                for done, (segment, (size, error)) in enumerate(
+                    zip(segments, results), 1
+                ):
+                    if error is not None:
+                        failed.append(segment.output_name)
+                        print(f"  × [{done}/{total}] {segment.output_name} : {error}")
+                        continue
+                    written += size
+                    print(f"  ✅ [{done}/{total}] {segment.output_name}")
+        finally:
+            # Un seul `.extract.json` réécrit, même après une erreur
+            self.manifest.compact()
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"⏱️ {total - len(failed)} segment(s), {utils.size_human_readable(written)} "
+            f"en {utils.format_duration(elapsed)}"
+        )
+        if failed:
+            print(f"❌ {len(failed)} segment(s) en erreur : {', '.join(failed)}")
+
+        failed_names = set(failed)
+        return [
+            self.output_folder / s.output_name
+            for s in planned
+            if s.output_name not in failed_names
+        ]
+
+    def plan_segments(self) -> List[ExtractSegment]:
+        """
+        Liste les segments à extraire de tous les fichiers, noms déterministes.
+        Seuls les chapitres de `selection` sont planifiés, avec le même nom
+        que lors d'une extraction complète.
+        """
+        segments: List[ExtractSegment] = []
+        time_base = MetadataChapterTable.TIME_BASE
+
+        for file_index, m4b_file in enumerate(self.m4b_files, 1):
+            probe = self.probe(m4b_file)
+            chapters = MetadataChapterTable.from_probe(probe.get("chapters", []))
+            source_tags: Dict[str, str] = probe.get("format", {}).get("tags", {})
+            print(f"{m4b_file.name} - Chapters: {len(chapters)}")
+
+            if not len(chapters):
+                if self.selection.indices or self.selection.title:
+                    print(f"⚠️ Aucun chapitre trouvé dans {m4b_file.name}. Ignoré.")
+                    continue
+                print(
+                    f"⚠️ Aucun chapitre trouvé dans {m4b_file.name}. Conversion globale."
+                )
+                full = self._segment(
+                    m4b_file,
+                    probe,
+                    self.full_name_pattern.format(file=file_index),
+                    source_tags.get("title", m4b_file.stem),
+                    1,
+                )
+                # Seule la fenêtre de temps s'applique au fichier entier
+                start, end = self.selection.start, self.selection.end
+                full.start = str(start / time_base) if start is not None else None
+                full.end = str(end / time_base) if end is not None else None
+                segments.append(full)
+                continue
+
+            # Largeur fixe pour garder l'ordre alphabétique au-delà de 99 chapitres
+            width = max(2, len(str(len(chapters))))
+            for i in self.selection.select(chapters):
+                # Récupération des données du chapitre
+                title = chapters.titles[i] or self.untitled_pattern.format(
+                    id=i, chapter=i + 1
+                )
+
+                # Formatage du nom : "01_01_Titre du Chapitre.mp3"
+                name = self.name_pattern.format(
+                    file=file_index,
+                    chapter=i + 1,
+                    width=width,
+                    title=self.sanitize_filename(title),
+                )
+                chapter = self._segment(m4b_file, probe, name, title, i + 1)
+
+                start, end = self.selection.clamp(chapters.starts[i], chapters.ends[i])
+                chapter.start = str(start / time_base)
+                chapter.end = str(end / time_base)
+                segments.append(chapter)
+
+        return segments
+
+    def _segment(
+        self,
+        m4b_file: Path,
+        probe: Dict[str, Any],
+        name: str,
+        title: str,
+        track: int,
+    ) -> ExtractSegment:
+        """Segment `name` de `m4b_file`, tags et cover de la source"""
+        file_format = probe.get("format", {})
+        bitrate = file_format.get("bit_rate")
+        has_cover = any(
+            s.get("disposition", {}).get("attached_pic")
+            for s in probe.get("streams", [])
+        )
+        return ExtractSegment(
+            m4b_file,
+            f"{name}.{self.output_format}",
+            tags=self._tags(file_format.get("tags", {}), title, track),
+            cover=self.with_cover and has_cover,
+            bitrate=int(bitrate) if bitrate else None,
+        )
+
+    def output_args(self, segment: ExtractSegment) -> List[str]:
+        """Arguments FFmpeg de sortie (flux, codec, tags), aussi gardés au manifeste"""
+        args = ["-map", "0:a:0"]
+        if segment.cover:
+            args.extend(["-map", "0:v:0", "-c:v", "copy"])
+            args.extend(["-disposition:v:0", "attached_pic"])
+
+        if self.output_format == "m4a":
+            # Copie du flux AAC sans décodage (découpe aux frames AAC)
+            args.extend(["-c:a", "copy"])
+        else:
+            args.extend(["-codec:a", "libmp3lame"])
+            if self.match_bitrate and segment.bitrate:
+                args.extend(["-b:a", f"{segment.bitrate // 1000}k"])
+            else:
+                args.extend(["-q:a", "2"])
+            # ID3v2.3 avec padding réservé : un futur tag ne réécrit pas le fichier
+            args.extend(["-id3v2_version", "3"])
+            args.extend(["-metadata_header_padding", str(self.ID3_PADDING)])
+
+        # Les chapitres du livre entier n'ont pas de sens dans un segment
+        args.extend(["-map_chapters", "-1"])
+        for key, value in segment.tags.items():
+            args.extend(["-metadata", f"{key}={value}"])
+
+        return args
+
+    def _tags(self, source: Dict[str, str], title: str, track: int) -> Dict[str, str]:
+        tags = {"title": title, "track": str(track)}
+        artist = source.get("artist", source.get("author"))
+        album = source.get("album", source.get("title"))
+        if artist:
+            tags["artist"] = artist
+        if album:
+            tags["album"] = album
+        return tags
+
+    def _try_export_segment(self, segment: ExtractSegment) -> Tuple[int, Optional[str]]:
+        """Taille écrite et erreur FFmpeg (`None` si le segment est extrait)"""
+        try:
+            return self._export_segment(segment), None
+        except subprocess.CalledProcessError as e:
+            stderr = (e.stderr or b"").decode(errors="replace").strip()
+            return 0, stderr or f"FFmpeg code {e.returncode}"
+        except OSError as e:
+            return 0, str(e)
+
+    def _export_segment(self, segment: ExtractSegment) -> int:
+        """Exécute la commande FFmpeg pour l'extraction, retourne la taille écrite."""
+        output_path = self.output_folder / segment.output_name
+        # Fichier temporaire renommé une fois complet : un fichier partiel
+        # (crash, interruption) n'est jamais pris pour un fichier terminé
+        tmp_path = output_path.with_name(
+            f".{output_path.stem}.part{output_path.suffix}"
+        )
+        start, end = segment.start, segment.end
+
+        # Commande FFmpeg : -ss (début), -to (fin), -i (entrée)
+        # -ss/-to AVANT -i : seek au niveau de l'entrée, FFmpeg ne décode que
+        # le chapitre (et non tout le livre depuis le début jusqu'au chapitre)
+        # En copie de flux (m4a), la découpe se fait à la frame AAC la plus proche
+        cmd = ["ffmpeg", "-y", "-v", "error"]
+
+        if start is not None:
+            cmd.extend(["-ss", start])
+        if end is not None:
+            cmd.extend(["-to", end])
+
+        cmd.extend(["-i", str(segment.input_file)])
+        settings = self.output_args(segment)
+        cmd.extend(settings)
+        cmd.append(str(tmp_path))
+
+        try:
+            # Erreurs capturées : affichées avec le segment, dans l'ordre du plan
+            subprocess.run(
+                cmd, check=True, stdin=subprocess.DEVNULL, capture_output=True
+            )
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        os.replace(tmp_path, output_path)
+        self.manifest.record(segment, settings)
+
+        return output_path.stat().st_size
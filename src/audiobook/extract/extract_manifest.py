@@ -0,0 +1,104 @@
+"""Manifest of files already extracted into an output folder."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+from .extract_segment import ExtractSegment
+
+
+class ExtractManifest:
+    """
+    Manifest of files already extracted into an output folder, stored as
+    `.extract.json`. For each output file: source identity (path, size,
+    mtime), chapter bounds, encode settings and output size. An output is
+    up to date only if all of them match, so a rerun skips finished files.
+
+    Finished segments are appended as JSON lines to `.extract.jsonl`
+    (one small write each), merged into `.extract.json` by `compact`.
+    """
+
+    FILENAME: str = ".extract.json"
+    JOURNAL_FILENAME: str = ".extract.jsonl"
+
+    def __init__(self, output_folder: Path):
+        self.path = output_folder / self.FILENAME
+        self.journal_path = output_folder / self.JOURNAL_FILENAME
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                # Manifeste illisible : tout sera ré-extrait
+                self._entries = {}
+        # Journal d'une extraction interrompue : entrées plus récentes
+        self._replay_journal()
+
+    def is_up_to_date(self, segment: ExtractSegment, settings: List[str]) -> bool:
+        """Output of `segment` exists and was extracted with same source and settings"""
+        output_path = self.path.parent / segment.output_name
+        entry = self._entries.get(segment.output_name)
+        if entry is None or not output_path.exists():
+            return False
+
+        return entry == self._entry(segment, settings, output_path)
+
+    def record(self, segment: ExtractSegment, settings: List[str]) -> None:
+        """Record extracted `segment` into journal (thread safe)"""
+        output_path = self.path.parent / segment.output_name
+        entry = self._entry(segment, settings, output_path)
+        line = json.dumps(
+            {"name": segment.output_name, "entry": entry}, ensure_ascii=False
+        )
+        with self._lock:
+            self._entries[segment.output_name] = entry
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def compact(self) -> None:
+        """Merge journal into `.extract.json`, once at the end of an extraction"""
+        with self._lock:
+            if not self.journal_path.exists():
+                return
+            self._save()
+            self.journal_path.unlink()
+
+    def _replay_journal(self) -> None:
+        if not self.journal_path.exists():
+            return
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par un crash
+                        continue
+                    self._entries[record["name"]] = record["entry"]
+        except OSError:
+            pass
+
+    def _entry(
+        self, segment: ExtractSegment, settings: List[str], output_path: Path
+    ) -> Dict[str, Any]:
+        source = segment.input_file.stat()
+        return {
+            "source": str(segment.input_file.resolve()),
+            "source_size": source.st_size,
+            "source_mtime": source.st_mtime_ns,
+            "start": segment.start,
+            "end": segment.end,
+            "settings": settings,
+            "size": output_path.stat().st_size,
+        }
+
+    def _save(self) -> None:
+        # Écriture atomique : un crash ne laisse jamais un manifeste tronqué
+        tmp_path = self.path.with_name(f"{self.FILENAME}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,18 @@
+"""Segment of M4B to extract as a single file."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class ExtractSegment:
+    """Segment of M4B to extract as a single file."""
+
+    input_file: Path
+    output_name: str
+    start: Optional[str] = None  # en secondes, `None` depuis le début du fichier
+    end: Optional[str] = None  # `None` jusqu'à la fin du fichier
+    tags: Dict[str, str] = field(default_factory=dict)  # écrits à l'encodage
+    cover: bool = False  # copie la couverture du M4B
+    bitrate: Optional[int] = None  # bitrate du M4B (bits/s)
@@ -0,0 +1,122 @@
+"""Chapters of M4B to extract: indices, title pattern and time window."""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+from audiobook.metadata import MetadataChapterTable
+
+
+@dataclass
+class ExtractSelection:
+    """
+    Chapters of M4B to extract. Filters are combined (all must match),
+    an empty selection keeps every chapter.
+    """
+
+    indices: Set[int] = field(default_factory=set)  # 1-based, comme les noms
+    title: Optional[re.Pattern[str]] = None
+    start: Optional[int] = None  # en unités `MetadataChapterTable.TIME_BASE`
+    end: Optional[int] = None
+
+    @classmethod
+    def parse(
+        cls,
+        chapters: Optional[str] = None,
+        title: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> "ExtractSelection":
+        """
+        Build selection from CLI strings: chapters like `1-3,7`, title as
+        regex (case insensitive), start and end as `SS`, `MM:SS` or `HH:MM:SS`.
+        """
+        selection = cls(
+            indices=cls._parse_indices(chapters) if chapters else set(),
+            title=re.compile(title, re.IGNORECASE) if title else None,
+            start=cls._parse_time(start) if start else None,
+            end=cls._parse_time(end) if end else None,
+        )
+        if (
+            selection.start is not None
+            and selection.end is not None
+            and selection.end <= selection.start
+        ):
+            raise ValueError(f"Fenêtre de temps vide : {start} -> {end}")
+
+        return selection
+
+    @property
+    def is_empty(self) -> bool:
+        """No filter, every chapter is extracted"""
+        return (
+            not self.indices
+            and self.title is None
+            and self.start is None
+            and self.end is None
+        )
+
+    @property
+    def has_window(self) -> bool:
+        """A time window is set"""
+        return self.start is not None or self.end is not None
+
+    def select(self, table: MetadataChapterTable) -> List[int]:
+        """0-based indices of `table` chapters to extract"""
+        if not len(table):
+            return []
+
+        if self.has_window:
+            # Recherche dichotomique sur la table, pas de parcours des chapitres
+            candidates = table.range_between(
+                self.start if self.start is not None else 0,
+                self.end if self.end is not None else table.ends[-1] + 1,
+            )
+        else:
+            candidates = range(len(table))
+
+        return [
+            i
+            for i in candidates
+            if (not self.indices or i + 1 in self.indices)
+            and (self.title is None or self.title.search(table.titles[i] or ""))
+        ]
+
+    def clamp(self, start: int, end: int) -> tuple[int, int]:
+        """Restrict [`start`, `end`] to the time window"""
+        if self.start is not None:
+            start = max(start, self.start)
+        if self.end is not None:
+            end = min(end, self.end)
+        return start, end
+
+    @staticmethod
+    def _parse_indices(value: str) -> Set[int]:
+        indices: Set[int] = set()
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            first, sep, last = part.partition("-")
+            try:
+                if sep:
+                    indices.update(range(int(first), int(last) + 1))
+                else:
+                    indices.add(int(first))
+            except ValueError as e:
+                raise ValueError(f"Sélection de chapitres invalide : {part}") from e
+
+        if not indices or min(indices) < 1:
+            raise ValueError(f"Sélection de chapitres invalide : {value}")
+
+        return indices
+
+    @staticmethod
+    def _parse_time(value: str) -> int:
+        seconds = 0.0
+        try:
+            for part in value.strip().split(":"):
+                seconds = seconds * 60 + float(part)
+        except ValueError as e:
+            raise ValueError(f"Temps invalide : {value}") from e
+
+        return MetadataChapterTable.seconds_to_time_base(seconds)
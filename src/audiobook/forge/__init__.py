@@ -1,5 +1,9 @@
 from .audiobook_forge import AudiobookForge
+from .encode_options import EncodeOptions
+from .ffmpeg_runner import FFmpegRunner
 
 __all__ = [
     "AudiobookForge",
+    "EncodeOptions",
+    "FFmpegRunner",
 ]
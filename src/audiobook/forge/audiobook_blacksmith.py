@@ -2,12 +2,13 @@
 
 import os
 from pathlib import Path
-from typing import List, Dict, cast
+from typing import List, Dict, Optional
 import subprocess
 from concurrent.futures import as_completed, Future
 from concurrent.futures.process import ProcessPoolExecutor
-from mutagen.mp3 import MP3, MPEGInfo
+from audiobook.audio import ID3HeaderReader
 from .audio_chapter import AudioChapter
+from .encode_options import EncodeOptions
 from .ffmpeg_runner import FFmpegRunner
 from .audiobook_fixer import AudiobookFixer
 
@@ -15,8 +16,9 @@ from .audiobook_fixer import AudiobookFixer
 class AudiobookBlacksmith:
     """Primary conversion manager with real-time logging."""
 
-    def __init__(self, directory_path: str):
+    def __init__(self, directory_path: str, options: Optional[EncodeOptions] = None):
         self.directory = Path(directory_path).resolve()
+        self.options = options or EncodeOptions()
         self.chapters: List[AudioChapter] = []
         self.target_bitrate: str = "128k"
         self.output_path = self.directory / f"{self.directory.name}.m4b"
@@ -36,8 +38,9 @@ class AudiobookBlacksmith:
         file_count: int = 0
 
         for f in mp3_files:
-            audio = MP3(f)
-            info = cast(MPEGInfo, audio.info)
+            # Lecture des frames texte uniquement, la cover n'est pas chargée
+            reader = ID3HeaderReader(f)
+            info = reader.info()
 
             # 1. Gestion du Bitrate
             current_br = int(getattr(info, "bitrate", 128000))
@@ -45,9 +48,7 @@ class AudiobookBlacksmith:
             file_count += 1
 
             # 2. Extraction du titre (Tag 'TIT2' ou nom de fichier en secours)
-            # audio.get("TIT2") renvoie un objet tag, on prend sa première valeur texte
-            title_tag = audio.get("TIT2")  # type: ignore
-            chapter_title = str(title_tag[0]) if title_tag else f.stem  # type: ignore
+            chapter_title = reader.title() or f.stem
 
             # Nettoyage optionnel : si le tag est vide ou juste des espaces
             if not chapter_title.strip():
@@ -119,6 +120,8 @@ class AudiobookBlacksmith:
             self._prepare_data()
             total = len(self.chapters)
             print(f"🚀 Encoding of {total} files on {os.cpu_count()} cores...")
+            if not self.options.is_empty:
+                print(f"🎚️ Filters: {self.options.audio_filter()}")
 
             future_to_file: Dict[Future[str], str] = {}
 
@@ -130,6 +133,7 @@ class AudiobookBlacksmith:
                         c.source_path,
                         c.temp_aac_path,
                         self.target_bitrate,
+                        self.options,
                     )
                     future_to_file[future] = c.source_path.name
 
@@ -3,15 +3,24 @@
 import subprocess
 import os
 from pathlib import Path
+from typing import Optional
 import audiobook.utils as utils
 from .audiobook_blacksmith import AudiobookBlacksmith
+from .encode_options import EncodeOptions
 
 
 class AudiobookForge:
     """Forge audiobook from MP3 to M4B with Python or audiobook-forge (Rust)"""
 
-    def __init__(self, mp3_directory: str, clear_old_file: bool = False):
+    def __init__(
+        self,
+        mp3_directory: str,
+        clear_old_file: bool = False,
+        options: Optional[EncodeOptions] = None,
+    ):
         self._mp3_directory = mp3_directory
+        # Filtres appliqués pendant l'encodage (Python uniquement)
+        self._options = options or EncodeOptions()
         parent = Path(mp3_directory).name
         self._m4b_file = f"{self._mp3_directory}/{parent}.m4b"
         self._size = 0
@@ -47,7 +56,7 @@ class AudiobookForge:
             print(f"File {self._m4b_file} exists, skipping forge...")
             return self
 
-        blacksmith = AudiobookBlacksmith(self._mp3_directory)
+        blacksmith = AudiobookBlacksmith(self._mp3_directory, self._options)
         blacksmith.process()
         blacksmith.validate()
 
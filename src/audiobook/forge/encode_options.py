@@ -0,0 +1,42 @@
+"""Audio filters applied while encoding MP3 to AAC"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class EncodeOptions:
+    """
+    Audio filters applied while encoding MP3 to AAC, so silences removal and
+    loudness normalization share the only decode/encode pass of forge.
+    """
+
+    remove_silences: bool = False
+    min_silence_len: int = 2000  # ms, comme `CleanSilences`
+    silence_thresh: int = -40  # dBFS
+    # Loudness intégrée cible (LUFS), `None` : pas de normalisation
+    loudness: Optional[float] = None
+
+    @property
+    def is_empty(self) -> bool:
+        """No filter to apply"""
+        return not self.remove_silences and self.loudness is None
+
+    def filters(self) -> List[str]:
+        """FFmpeg audio filters, in order"""
+        filters: List[str] = []
+        if self.remove_silences:
+            filters.append(
+                f"silenceremove=stop_periods=-1:"
+                f"stop_duration={self.min_silence_len / 1000.0}:"
+                f"stop_threshold={self.silence_thresh}dB"
+            )
+        if self.loudness is not None:
+            # Une passe (mode dynamique) : pas de décodage supplémentaire
+            filters.append(f"loudnorm=I={self.loudness}:TP=-1.5:LRA=11")
+        return filters
+
+    def audio_filter(self) -> Optional[str]:
+        """Value of `-af`, `None` without filter"""
+        filters = self.filters()
+        return ",".join(filters) if filters else None
@@ -2,14 +2,25 @@
 
 import subprocess
 from pathlib import Path
+from typing import Optional
+from .encode_options import EncodeOptions
 
 
 class FFmpegRunner:
     """Forge FFmpeg runner"""
 
     @staticmethod
-    def encode_to_aac(input_path: Path, output_path: Path, bitrate: str) -> str:
-        """Encode audio file to AAC"""
+    def encode_to_aac(
+        input_path: Path,
+        output_path: Path,
+        bitrate: str,
+        options: Optional[EncodeOptions] = None,
+    ) -> str:
+        """Encode audio file to AAC, with `options` filters in the same pass"""
+        # Silences et loudness filtrés pendant l'encodage : une seule génération
+        audio_filter = options.audio_filter() if options else None
+        filter_args = ["-af", audio_filter] if audio_filter else []
+
         cmd = [
             "ffmpeg",
             "-y",
@@ -22,6 +33,7 @@ class FFmpegRunner:
             "-vn",
             "-sn",
             "-dn",  # Ignore tout ce qui n'est pas audio
+            *filter_args,
             "-c:a",
             "aac",
             "-b:a",
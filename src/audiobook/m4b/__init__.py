@@ -1,4 +1,6 @@
+from .m4b_appender import M4bAppender
 from .m4b_chapter_editor import M4bChapterEditor
+from .m4b_manifest import M4bManifest
 from .m4b_merger import M4BMerger
 from .m4b_renamer import M4bRenamer
 from .m4b_split import M4bSplit
@@ -6,7 +8,9 @@ from .m4b_tagger import M4bTagger
 from .m4b_to_mp3_plitter import M4BToMP3Splitter
 
 __all__ = [
+    "M4bAppender",
     "M4bChapterEditor",
+    "M4bManifest",
     "M4BMerger",
     "M4bRenamer",
     "M4bSplit",
@@ -0,0 +1,211 @@
+"""Append new MP3 chapters to an existing multipart M4B audiobook"""
+
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from audiobook.audio import ID3HeaderReader
+from audiobook.config import ConfigFusion
+from audiobook.env import PART_SIZE
+from audiobook.forge import FFmpegRunner
+from audiobook.metadata import MetadataChapterTable, MetadataFile
+import audiobook.utils as utils
+from .m4b_merge_input import M4bMergeInput
+from .m4b_merger import M4BMerger
+
+
+class M4bAppender:
+    """
+    Append new MP3 chapters to an existing multipart M4B audiobook.
+
+    Only new MP3 files are encoded (same AAC settings as the last part).
+    They are appended to the last part while it stays under `PART_SIZE`,
+    the others go to new parts. Existing parts are never decoded: only the
+    last one is re-muxed (stream copy), earlier parts are not touched.
+    """
+
+    def __init__(self, config: ConfigFusion, max_workers: Optional[int] = None):
+        self._config = config
+        self._parts: List[MetadataFile] = config.m4b_metadata
+        self._temporary_directory = config.temporary_directory_path
+        self.max_workers = max_workers or os.cpu_count()
+        self.max_part_size: int = PART_SIZE * 1024 * 1024
+        # Parties réécrites ou créées
+        self.m4b_paths: List[str] = []
+
+    def run(self) -> "M4bAppender":
+        """Encode new chapters and append them"""
+        if not self._parts:
+            print(f"Error: no M4B into {self._config.m4b_directory}")
+            return self
+
+        chapters = self._new_chapters()
+        if not chapters:
+            print("  ➖ No new chapter to append")
+            return self
+
+        last = self._parts[-1]
+        last_input = M4bMergeInput(
+            os.path.abspath(last.path),
+            last.chapter_table,
+            last.exact_duration or 0,
+            last.audio_stream or {},
+        )
+        encoded = self._encode(chapters, self._bitrate(last_input))
+        appended, new_parts = self._plan(last_input, encoded)
+        merger = M4BMerger(self._config)
+
+        if appended:
+            self._append_to_last(merger, last_input, appended)
+        for index, group in enumerate(new_parts, len(self._parts) + 1):
+            self._write_new_part(merger, group, index, last)
+
+        return self
+
+    def _new_chapters(self) -> List[Tuple[str, str]]:
+        """MP3 files (path, title) whose title is not already a chapter"""
+        existing = {
+            title for part in self._parts for title in part.chapter_table.titles
+        }
+        chapters: List[Tuple[str, str]] = []
+
+        for mp3 in self._config.mp3_list:
+            # Même titre de chapitre que forge : tag `TIT2` ou nom de fichier
+            title = ID3HeaderReader(mp3).title() or Path(mp3).stem
+            if title in existing:
+                print(f"  ⏭️ Already into audiobook: {title}")
+                continue
+            chapters.append((mp3, title))
+
+        return chapters
+
+    @staticmethod
+    def _bitrate(last: M4bMergeInput) -> str:
+        """AAC bitrate of last part, so new chapters can be stream copied with it"""
+        bit_rate = last.stream.get("bit_rate")
+        return f"{int(bit_rate) // 1000}k" if bit_rate else "128k"
+
+    def _encode(
+        self, chapters: List[Tuple[str, str]], bitrate: str
+    ) -> List[M4bMergeInput]:
+        """Encode new MP3 files to AAC in parallel, durations probed on output"""
+        outputs = [
+            Path(self._temporary_directory) / f"chapter_{i:04d}.m4a"
+            for i in range(len(chapters))
+        ]
+        total = len(chapters)
+        print(f"🚀 Encoding of {total} new files ({bitrate})...")
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                FFmpegRunner.encode_to_aac,
+                [Path(mp3) for mp3, _ in chapters],
+                outputs,
+                [bitrate] * total,
+            )
+            for done, name in enumerate(results, 1):
+                print(f"  ✅ [{done}/{total}] Done: {name}")
+
+        # Durées exactes des fichiers encodés : offsets des chapitres sans dérive
+        with ThreadPoolExecutor(max_workers=min(total, 8)) as executor:
+            probed = list(executor.map(M4BMerger.probe_input, map(str, outputs)))
+
+        for item, (_, title) in zip(probed, chapters):
+            item.chapters = MetadataChapterTable([0], [item.duration], [title])
+        return probed
+
+    def _plan(
+        self, last: M4bMergeInput, encoded: List[M4bMergeInput]
+    ) -> Tuple[List[M4bMergeInput], List[List[M4bMergeInput]]]:
+        """
+        Chapters appended to the last part (while under `PART_SIZE` and with
+        the same codec), then the others grouped into new parts.
+        """
+        appended: List[M4bMergeInput] = []
+        size = os.path.getsize(last.path)
+        remaining = list(encoded)
+
+        # Codec différent : la dernière partie ne serait plus copiable telle quelle
+        if encoded and encoded[0].codec == last.codec:
+            while remaining:
+                chapter_size = os.path.getsize(remaining[0].path)
+                if size + chapter_size > self.max_part_size:
+                    break
+                size += chapter_size
+                appended.append(remaining.pop(0))
+
+        new_parts: List[List[M4bMergeInput]] = []
+        size = 0
+        for item in remaining:
+            chapter_size = os.path.getsize(item.path)
+            if not new_parts or size + chapter_size > self.max_part_size:
+                new_parts.append([])
+                size = 0
+            new_parts[-1].append(item)
+            size += chapter_size
+
+        return appended, new_parts
+
+    def _append_to_last(
+        self, merger: M4BMerger, last: M4bMergeInput, appended: List[M4bMergeInput]
+    ) -> None:
+        """Re-mux last part with `appended` chapters, then replace it"""
+        path = Path(last.path)
+
+        with self._temporary_dir(path) as temp_dir:
+            temp_path = Path(temp_dir) / path.name
+            if not merger.mux([last, *appended], str(temp_path)):
+                raise RuntimeError(f"Fusion failed for {path.name}")
+            os.replace(temp_path, path)
+
+        self.m4b_paths.append(str(path))
+        self._print_part(path, len(appended), "appended to")
+
+    def _write_new_part(
+        self,
+        merger: M4BMerger,
+        chapters: List[M4bMergeInput],
+        index: int,
+        last: MetadataFile,
+    ) -> None:
+        """Create part `index` with `chapters`, tags and cover of last part"""
+        last_path = Path(last.path)
+        path = last_path.with_name(
+            f"{self._numbered(last_path.stem, index, ' - Part ')}.m4b"
+        )
+
+        with self._temporary_dir(path) as temp_dir:
+            temp_path = Path(temp_dir) / path.name
+            if not merger.mux(chapters, str(temp_path), tags_path=str(last_path)):
+                raise RuntimeError(f"Fusion failed for {path.name}")
+
+            file = MetadataFile(str(temp_path), load_chapters=False)
+            tags: Dict[str, Any] = {"track": index}
+            if last.title:
+                tags["title"] = self._numbered(str(last.title), index, ", Part ")
+            file.update_tags(tags)
+            os.replace(temp_path, path)
+
+        self.m4b_paths.append(str(path))
+        self._print_part(path, len(chapters), "new part")
+
+    @staticmethod
+    def _temporary_dir(path: Path) -> tempfile.TemporaryDirectory[str]:
+        """
+        Hidden directory next to `path`: `os.replace` stays atomic (same disk)
+        and the part being written is not listed with the `*.m4b` parts.
+        """
+        return tempfile.TemporaryDirectory(prefix=".fusion_", dir=path.parent)
+
+    @staticmethod
+    def _numbered(name: str, index: int, separator: str) -> str:
+        """`name` with its part number replaced by `index`"""
+        numbered, count = re.subn(r"(Part\s*)\d+$", rf"\g<1>{index:02d}", name)
+        return numbered if count else f"{name}{separator}{index:02d}"
+
+    @staticmethod
+    def _print_part(path: Path, chapters: int, action: str) -> None:
+        size = utils.size_human_readable(utils.get_file_size(str(path)))
+        print(f"  ✅ {chapters} chap. {action} `{path.name}` / {size}")
@@ -0,0 +1,85 @@
+"""Detect if MP3 sources of an already built audiobook are unchanged"""
+
+import hashlib
+from pathlib import Path
+from typing import List, Optional
+from mutagen import MutagenError
+from audiobook.audio import ID3HeaderReader
+from audiobook.config import ConfigBuild
+from audiobook.env import PART_SIZE
+from audiobook.metadata import MetadataFile
+import audiobook.utils as utils
+
+
+class M4bManifest:
+    """
+    Detect if MP3 sources of an already built audiobook are unchanged.
+
+    Digest covers, for each MP3 source: filename, chapter title and audio
+    data (ID3 tags and cover excluded), with `PART_SIZE` and encode filters
+    (a build with other filters is a full build). It is stored into
+    each M4B part, so a build with the same digest only needs to update tags,
+    and into the forged M4B, which is only reused for the same digest.
+    """
+
+    def __init__(self, config: ConfigBuild):
+        self._config = config
+        self._digest: Optional[str] = None
+
+    @property
+    def digest(self) -> str:
+        """Digest of MP3 sources, computed once"""
+        if self._digest is None:
+            self._digest = self._compute_digest()
+        return self._digest
+
+    def find_parts(self) -> List[str]:
+        """
+        Find M4B parts built from the same MP3 sources: into `m4b_directory_output`
+        or, if title changed, into another subdirectory of `mp3_directory`
+        """
+        if not self._config.mp3_list:
+            return []
+
+        output = Path(self._config.m4b_directory_output).resolve()
+        directories = [output] + [
+            p.resolve()
+            for p in sorted(Path(self._config.mp3_directory).iterdir())
+            if p.is_dir() and p.resolve() != output
+        ]
+
+        for directory in directories:
+            parts = utils.get_files(str(directory), "m4b")
+            if parts and all(self.is_built_from_sources(p) for p in parts):
+                return parts
+
+        return []
+
+    def is_built_from_sources(self, m4b_path: str) -> bool:
+        """Check if M4B (part or forged M4B) stores the digest of current sources"""
+        if not Path(m4b_path).is_file():
+            return False
+        try:
+            file = MetadataFile(m4b_path, load_chapters=False)
+            return file.source_digest == self.digest
+        except (MutagenError, OSError):
+            return False
+
+    def stamp(self, m4b_path: str) -> None:
+        """Store digest of current sources into M4B"""
+        MetadataFile(m4b_path, load_chapters=False).update_source_digest(self.digest)
+
+    def _compute_digest(self) -> str:
+        digest = hashlib.sha256(f"PART_SIZE={PART_SIZE}\n".encode("utf-8"))
+        # Sans filtre, le digest reste celui des builds existants
+        audio_filter = self._config.encode_options.audio_filter()
+        if audio_filter:
+            digest.update(f"FILTER={audio_filter}\n".encode("utf-8"))
+
+        for path in self._config.mp3_list:
+            reader = ID3HeaderReader(path)
+            title = reader.title() or Path(path).stem
+            digest.update(f"{Path(path).name}\n{title}\n".encode("utf-8"))
+            digest.update(reader.audio_hash())
+
+        return digest.hexdigest()
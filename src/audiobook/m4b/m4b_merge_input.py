@@ -0,0 +1,36 @@
+"""M4B file to merge, with its chapters, duration and codec parameters."""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+from audiobook.metadata import MetadataChapterTable
+
+# (codec_name, sample_rate, channels, channel_layout)
+CodecSignature = Tuple[Optional[str], Optional[int], Optional[int], Optional[str]]
+
+
+@dataclass
+class M4bMergeInput:
+    """M4B file to merge, with its chapters, duration and codec parameters."""
+
+    path: str
+    chapters: MetadataChapterTable
+    duration: int  # en unités `MetadataChapterTable.TIME_BASE`
+    stream: dict[str, Any]  # flux audio de `ffprobe`
+    # Fichier ré-encodé à utiliser à la place de `path`, si codec différent
+    transcoded_path: Optional[str] = None
+
+    @property
+    def codec(self) -> CodecSignature:
+        """Parameters which must be identical to concatenate with stream copy"""
+        sample_rate = self.stream.get("sample_rate")
+        return (
+            self.stream.get("codec_name"),
+            int(sample_rate) if sample_rate else None,
+            self.stream.get("channels"),
+            self.stream.get("channel_layout"),
+        )
+
+    @property
+    def concat_path(self) -> str:
+        """Path to give to concat demuxer"""
+        return self.transcoded_path or self.path
@@ -1,13 +1,24 @@
+import itertools
 import os
-from typing import List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 import ffmpeg  # type: ignore
 from mutagen.mp4 import MP4
-from audiobook.metadata import MetadataFile
-from audiobook.config import ConfigExtract
+from audiobook.metadata import MetadataFile, MetadataChapterTable
+from audiobook.config import ConfigExtract, ConfigFusion
+from .m4b_merge_input import M4bMergeInput
 
 
 class M4BMerger:
-    def __init__(self, config: ConfigExtract):
+    # Encodeur FFmpeg pour un `codec_name` de ffprobe, s'il diffère
+    ENCODERS: Dict[str, str] = {
+        "mp3": "libmp3lame",
+        "opus": "libopus",
+        "vorbis": "libvorbis",
+    }
+
+    def __init__(self, config: ConfigExtract | ConfigFusion):
         self._file_paths: List[str] = config.m4b_list
         self._files_metadata: List[MetadataFile] = config.m4b_metadata
         self._temporary_directory: str = config.temporary_directory_path
@@ -20,40 +31,65 @@ class M4BMerger:
 
     def merge(self, output_filename: str = "merged_audiobook.m4b") -> Optional[str]:
         sorted_list = self._sort_files()
-        sorted_paths = [os.path.abspath(f.path) for f in sorted_list]
 
-        if not sorted_paths:
+        if not sorted_list:
             return None
 
         output_path = os.path.join(self._temporary_directory, output_filename)
+        return self.mux(self._load_inputs(sorted_list), output_path)
+
+    def mux(
+        self,
+        inputs: List[M4bMergeInput],
+        output_path: str,
+        tags_path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Concatenate `inputs` with stream copy into `output_path`, chapters
+        shifted by exact durations. Tags and cover come from `tags_path`
+        (first input by default).
+        """
+        tags_path = tags_path or inputs[0].path
         concat_list_path = os.path.join(self._temporary_directory, "concat_list.txt")
         meta_file_path = os.path.join(
             self._temporary_directory, "metadata_chapters.txt"
         )
 
         try:
-            # 1. FFmpeg Concat List
+            # 1. Codecs : seuls les fichiers différents de la majorité sont ré-encodés
+            self._align_codecs(inputs)
+
+            # 2. FFmpeg Concat List
             with open(concat_list_path, "w", encoding="utf-8") as f:
-                for path in sorted_paths:
+                for item in inputs:
+                    path = item.concat_path
                     f.write(f"file '{path.replace("'", "'\\''")}'\n")
 
-            # 2. Rebuild Chapters
-            self._generate_merged_metadata(sorted_paths, meta_file_path)
+            # 3. Rebuild Chapters
+            self._generate_merged_metadata(inputs, meta_file_path)
 
-            # 3. FFmpeg Merge
+            # 4. FFmpeg Merge
+            # Entrées : 0 = concat, 1 = chapitres, 2 = `tags_path` (tags, cover)
+            # Tags standards et cover sont écrits pendant le mux, en une passe
             input_audio = ffmpeg.input(concat_list_path, format="concat", safe=0)  # type: ignore
             (
                 ffmpeg.output(  # type: ignore
-                    input_audio["a"], output_path, c="copy", map_metadata=1, vn=None  # type: ignore
+                    input_audio["a"],  # type: ignore
+                    output_path,
+                    c="copy",
+                    map="2:v?",
+                    map_chapters=1,
+                    map_metadata=2,
+                    **{"disposition:v": "attached_pic"},
                 )
-                .global_args("-i", meta_file_path)
+                .global_args("-i", meta_file_path, "-i", tags_path)
                 .overwrite_output()
                 .run(capture_stdout=True, capture_stderr=True)
             )
 
-            # 4. RESTORE CUSTOM ATOMS / TAGS
-            # On copie les tags du premier fichier source vers le fichier fusionné
-            self._copy_mp4_atoms(sorted_paths[0], output_path)
+            # 5. RESTORE CUSTOM ATOMS / TAGS
+            # Seuls les atomes que FFmpeg ne sait pas écrire (freeform) manquent
+            self._copy_mp4_atoms(tags_path, output_path)
 
             print(f"Successfully merged: {output_path}")
             return output_path
@@ -62,53 +98,152 @@ class M4BMerger:
             print(f"FFmpeg Error: {e.stderr.decode() if e.stderr else str(e)}")  # type: ignore
             return None
         finally:
-            for p in [concat_list_path, meta_file_path]:
+            transcoded = [i.transcoded_path for i in inputs if i.transcoded_path]
+            for p in [concat_list_path, meta_file_path, *transcoded]:
                 if os.path.exists(p):
                     os.remove(p)
 
     def _copy_mp4_atoms(self, source_path: str, destination_path: str) -> None:
         """
-        Copies all MP4 tags (atoms) including custom ones from source to destination.
+        Copies MP4 tags (atoms) missing after the mux, like freeform ones,
+        from source to destination. Nothing is written if all are present.
         """
         try:
             source = MP4(source_path)
-            destination = MP4(destination_path)
+            if not source.tags:
+                return
 
-            # On copie tous les tags (dictionnaire de clés/valeurs)
-            # source.tags contient les atomes comme '\xa9nam' (titre), 'aART' (album artist), etc.
-            for key, value in source.tags.items():  # type: ignore
-                destination.tags[key] = value  # type: ignore
-
-            destination.save()  # type: ignore
+            # `moov` est en fin de fichier FFmpeg : seule la fin est réécrite
+            destination = MetadataFile(destination_path, load_chapters=False)
+            destination.update_atoms(dict(source.tags), save=True)  # type: ignore
         except Exception as e:
             print(f"Warning: Failed to copy custom atoms: {e}")
 
+    def _load_inputs(self, files: List[MetadataFile]) -> List[M4bMergeInput]:
+        """
+        Chapters, exact duration and codec of each file: reused from
+        `MetadataFile` when already loaded by `ConfigExtract`, otherwise
+        probed in parallel.
+        """
+        missing = [
+            os.path.abspath(f.path)
+            for f in files
+            if f.exact_duration is None or f.audio_stream is None
+        ]
+        probed: Dict[str, M4bMergeInput] = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), 8)) as executor:
+                probed = dict(zip(missing, executor.map(self.probe_input, missing)))
+
+        return [
+            (
+                probed[os.path.abspath(f.path)]
+                if f.exact_duration is None or f.audio_stream is None
+                else M4bMergeInput(
+                    os.path.abspath(f.path),
+                    f.chapter_table,
+                    f.exact_duration,
+                    f.audio_stream,
+                )
+            )
+            for f in files
+        ]
+
+    @staticmethod
+    def probe_input(path: str) -> M4bMergeInput:
+        """Chapters, exact duration and audio stream of `path` with ffprobe"""
+        probe = ffmpeg.probe(path, show_chapters=None)  # type: ignore
+        stream = next(
+            (s for s in probe.get("streams", []) if s.get("codec_type") == "audio"),
+            {},
+        )
+        return M4bMergeInput(
+            path,
+            MetadataChapterTable.from_probe(probe.get("chapters", [])),
+            MetadataChapterTable.duration_from_probe(probe),
+            stream,
+        )
+
+    def _align_codecs(self, inputs: List[M4bMergeInput]) -> None:
+        """
+        Re-encode inputs whose codec parameters differ from the majority,
+        so the concat demuxer can stream copy every file.
+        """
+        counts = Counter(i.codec for i in inputs)
+        # Majorité, le premier fichier départage les égalités
+        target = max(counts, key=lambda c: (counts[c], c == inputs[0].codec))
+        outliers = [i for i in inputs if i.codec != target]
+        if not outliers:
+            return
+
+        reference = next(i for i in inputs if i.codec == target)
+        print(f"  🎛️ {len(outliers)} fichier(s) ré-encodé(s) : codec différent")
+
+        with ThreadPoolExecutor(max_workers=min(len(outliers), 8)) as executor:
+            list(
+                executor.map(
+                    self._transcode,
+                    range(len(outliers)),
+                    outliers,
+                    itertools.repeat(reference),
+                )
+            )
+
+    def _transcode(
+        self, index: int, item: M4bMergeInput, reference: M4bMergeInput
+    ) -> None:
+        codec_name, sample_rate, channels, channel_layout = reference.codec
+        output_path = os.path.join(
+            self._temporary_directory,
+            f"transcoded_{index}_{os.path.basename(item.path)}",
+        )
+
+        # Codec inconnu de ffprobe : AAC, celui des M4B
+        codec = codec_name or "aac"
+        output_args: Dict[str, Any] = {
+            "acodec": self.ENCODERS.get(codec, codec),
+            "vn": None,
+            "map_chapters": -1,
+        }
+        if sample_rate:
+            output_args["ar"] = sample_rate
+        if channels:
+            output_args["ac"] = channels
+        if channel_layout:
+            output_args["channel_layout"] = channel_layout
+        if reference.stream.get("bit_rate"):
+            output_args["audio_bitrate"] = reference.stream["bit_rate"]
+
+        (
+            ffmpeg.input(item.path)  # type: ignore
+            .output(output_path, **output_args)
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+
+        # La durée ré-encodée (échantillons) peut différer légèrement
+        item.transcoded_path = output_path
+        item.duration = self.probe_input(output_path).duration
+
     def _generate_merged_metadata(
-        self, paths: List[str], output_meta_path: str
+        self, inputs: List[M4bMergeInput], output_meta_path: str
     ) -> None:
         """Creates a FFMETADATA1 file with recalculated chapters."""
         metadata_content = [";FFMETADATA1"]
+        merged = MetadataChapterTable()
+        # Offsets en entiers (nombre d'échantillons converti) : pas de dérive
         cumulative_offset_ns = 0
 
-        for path in paths:
-            probe = ffmpeg.probe(path, show_chapters=None)  # type: ignore
-            chapters = probe.get("chapters", [])
-            duration_s = float(probe.get("format", {}).get("duration", 0))
-            duration_ns = int(duration_s * 1_000_000_000)
-
-            for chap in chapters:
-                tb_num, tb_den = map(int, chap["time_base"].split("/"))
-                start_ns = int(int(chap["start"]) * tb_num * 1_000_000_000 / tb_den)
-                end_ns = int(int(chap["end"]) * tb_num * 1_000_000_000 / tb_den)
-                title = chap.get("tags", {}).get("title", "Unknown Chapter")
-
-                metadata_content.append("\n[CHAPTER]")
-                metadata_content.append("TIMEBASE=1/1000000000")
-                metadata_content.append(f"START={cumulative_offset_ns + start_ns}")
-                metadata_content.append(f"END={cumulative_offset_ns + end_ns}")
-                metadata_content.append(f"title={title}")
-
-            cumulative_offset_ns += duration_ns
+        for item in inputs:
+            merged.extend(item.chapters.shifted(cumulative_offset_ns))
+            cumulative_offset_ns += item.duration
+
+        for start, end, title in zip(merged.starts, merged.ends, merged.titles):
+            metadata_content.append("\n[CHAPTER]")
+            metadata_content.append(f"TIMEBASE=1/{MetadataChapterTable.TIME_BASE}")
+            metadata_content.append(f"START={start}")
+            metadata_content.append(f"END={end}")
+            metadata_content.append(f"title={title or 'Unknown Chapter'}")
 
         with open(output_meta_path, "w", encoding="utf-8") as f:
             f.write("\n".join(metadata_content))
@@ -5,7 +5,7 @@ from pathlib import Path
 import os
 import subprocess
 from audiobook.config import ConfigBuild
-from audiobook.metadata import MetadataChapter
+from audiobook.metadata import MetadataChapterTable
 import audiobook.utils as utils
 from audiobook.env import PART_SIZE
 
@@ -22,7 +22,7 @@ class M4bSplit:
         self.m4b_split_paths: list[str] = []
 
         if config.m4b_forge_metadata:
-            self._chapters = config.m4b_forge_metadata.chapters
+            self._chapters = config.m4b_forge_metadata.chapter_table
             self._split_plan = self._handle_split_plan()
 
     def run(self):
@@ -30,11 +30,14 @@ class M4bSplit:
         temporary_dir = Path(self._temp_directory.name)
         generated_files: List[Path] = []
 
+        chapters = self._chapters
+        time_base = MetadataChapterTable.TIME_BASE
+
         for i, part_chapters in enumerate(self._split_plan, 1):
-            first_chapter = part_chapters[0]
-            last_chapter = part_chapters[-1]
-            start_t = float(first_chapter.start_time)
-            end_t = float(last_chapter.end_time)
+            part_start = chapters.starts[part_chapters[0]]
+            part_end = chapters.ends[part_chapters[-1]]
+            start_t = part_start / time_base
+            end_t = part_end / time_base
             duration = end_t - start_t
 
             output_file = (
@@ -45,13 +48,13 @@ class M4bSplit:
             meta_file = temporary_dir / f"metadata_part_{i}.txt"
             with open(meta_file, "w", encoding="utf-8") as f:
                 f.write(";FFMETADATA1\n")
-                for chap in part_chapters:
-                    c_start = int((float(chap.start_time) - start_t) * 1000)
-                    c_end = int((float(chap.end_time) - start_t) * 1000)
+                for c in part_chapters:
+                    c_start = (chapters.starts[c] - part_start) * 1000 // time_base
+                    c_end = (chapters.ends[c] - part_start) * 1000 // time_base
                     f.write("\n[CHAPTER]\nTIMEBASE=1/1000\n")
                     f.write(f"START={c_start}\n")
                     f.write(f"END={c_end}\n")
-                    f.write(f"title={chap.title}\n")
+                    f.write(f"title={chapters.titles[c]}\n")
 
             # --- ÉTAPE 2: Exécuter FFmpeg (Indispensable AVANT de calculer la taille) ---
             cmd = [
@@ -100,36 +103,21 @@ class M4bSplit:
         self.m4b_split_paths = [str(p) for p in generated_files]
         return self
 
-    def _handle_split_plan(self) -> List[List[MetadataChapter]]:
-        """Calculate which chapters go in which section based on the target size"""
-        plan: List[List[MetadataChapter]] = []
-
+    def _handle_split_plan(self) -> List[range]:
+        """
+        Calculate which chapters go in which section based on the target size,
+        as ranges of chapter indices
+        """
         if not self._m4b_path:
             print("Error: no M4B file")
-            return plan
-
-        file_size_mb = os.path.getsize(self._m4b_path) / (1024 * 1024)
-        last_chapter = self._chapters[-1]
-        total_duration = float(last_chapter.end_time)
-        mb_per_second = file_size_mb / total_duration
+            return []
 
-        current_part: List[MetadataChapter] = []
-        current_part_size = 0.0
+        if not len(self._chapters):
+            return []
 
-        for chapter in self._chapters:
-            duration = float(chapter.end_time) - float(chapter.start_time)
-            chapter_size_mb = duration * mb_per_second
-
-            size = current_part_size + chapter_size_mb > PART_SIZE
-            if size and current_part:
-                plan.append(current_part)
-                current_part = []
-                current_part_size = 0.0
-
-            current_part.append(chapter)
-            current_part_size += chapter_size_mb
-
-        if current_part:
-            plan.append(current_part)
+        file_size_mb = os.path.getsize(self._m4b_path) / (1024 * 1024)
+        total_duration = self._chapters.ends[-1]
+        # Max duration of a part (`TIME_BASE` units) to stay under PART_SIZE
+        max_duration = int(PART_SIZE / file_size_mb * total_duration)
 
-        return plan
+        return self._chapters.split_by_duration(max_duration)
@@ -10,17 +10,28 @@ class M4bTagger:
     def __init__(self, config: ConfigBuild):
         self._config = config
         self._listing = self._config.m4b_split_paths
+        self.updated = 0
+        self.skipped = 0
 
     def run(self):
-        """Execute update"""
+        """Execute update, files already up to date are not saved"""
         i = 1
         yml = self._config.metadata_yml
         for m4b_path in self._listing:
-            file = MetadataFile(m4b_path)
-            file.update_tags(yml.tags_standard(i))
-            file.update_tags_custom(yml.tags_custom())
+            file = MetadataFile(m4b_path, load_chapters=False)
+            file.update_tags(yml.tags_standard(i), save=False)
+            file.update_tags_custom(yml.tags_custom(), save=False)
             if self._config.cover_path:
-                file.update_cover(self._config.cover_path)
+                file.update_cover(self._config.cover_path, save=False)
+            if self._config.source_digest:
+                file.update_source_digest(self._config.source_digest, save=False)
+
+            if file.save():
+                self.updated += 1
+            else:
+                self.skipped += 1
             i = i + 1
 
+        print(f"  🔖 {self.updated} updated, {self.skipped} already up to date")
+
         return self
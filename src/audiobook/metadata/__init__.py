@@ -1,11 +1,13 @@
 from .metadata_audiobook import MetadataAudiobook
 from .metadata_chapter import MetadataChapter
+from .metadata_chapter_table import MetadataChapterTable
 from .metadata_file import MetadataFile
 from .metadata_yml import MetadataYml
 
 __all__ = [
     "MetadataAudiobook",
     "MetadataChapter",
+    "MetadataChapterTable",
     "MetadataFile",
     "MetadataYml",
 ]
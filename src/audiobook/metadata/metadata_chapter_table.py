@@ -0,0 +1,164 @@
+"""M4B chapters as columns (start, end, title)"""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from itertools import accumulate
+from typing import Any, Iterable, List, Optional
+
+
+class MetadataChapterTable:
+    """
+    M4B chapters as columns: start and end are stored as integers in
+    `TIME_BASE` units (nanoseconds) into `array`, titles are interned.
+    Built once from ffprobe output, no `float(str)` parsing in loops.
+    """
+
+    TIME_BASE: int = 1_000_000_000
+
+    def __init__(
+        self,
+        starts: Iterable[int] = (),
+        ends: Iterable[int] = (),
+        titles: Iterable[Optional[str]] = (),
+    ):
+        self.starts = array("q", starts)
+        self.ends = array("q", ends)
+        self.titles: List[Optional[str]] = [
+            sys.intern(t) if t is not None else None for t in titles
+        ]
+
+        if not len(self.starts) == len(self.ends) == len(self.titles):
+            raise ValueError("Chapter table columns must have the same length")
+
+    @classmethod
+    def from_probe(cls, chapters: Iterable[dict[str, Any]]) -> "MetadataChapterTable":
+        """Build table from `ffprobe -show_chapters` chapters"""
+        starts: List[int] = []
+        ends: List[int] = []
+        titles: List[Optional[str]] = []
+
+        for chap in chapters:
+            time_base = Fraction(str(chap.get("time_base", "1/1000")))
+            starts.append(cls._to_time_base(chap.get("start", 0), time_base))
+            ends.append(cls._to_time_base(chap.get("end", 0), time_base))
+            tags = chap.get("tags") or {}
+            titles.append(str(tags["title"]) if "title" in tags else None)
+
+        return cls(starts, ends, titles)
+
+    @classmethod
+    def duration_from_probe(cls, probe: dict[str, Any]) -> int:
+        """
+        Exact duration (`TIME_BASE` units) from `ffprobe` output: sample count
+        of first audio stream (`duration_ts` * `time_base`), format duration
+        as fallback
+        """
+        for stream in probe.get("streams", []):
+            if stream.get("codec_type") != "audio":
+                continue
+            if "duration_ts" in stream and "time_base" in stream:
+                time_base = Fraction(str(stream["time_base"]))
+                return cls._to_time_base(stream["duration_ts"], time_base)
+            break
+
+        return cls.seconds_to_time_base(probe.get("format", {}).get("duration", 0))
+
+    @classmethod
+    def seconds_to_time_base(cls, seconds: float | str) -> int:
+        """Convert seconds (`float` or ffprobe `str`) to `TIME_BASE` units"""
+        return round(Fraction(str(seconds)) * cls.TIME_BASE)
+
+    @classmethod
+    def _to_time_base(cls, value: Any, time_base: Fraction) -> int:
+        return int(Fraction(int(value)) * time_base * cls.TIME_BASE)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def start_time(self, index: int) -> float:
+        """Start of chapter `index` in seconds"""
+        return self.starts[index] / self.TIME_BASE
+
+    def end_time(self, index: int) -> float:
+        """End of chapter `index` in seconds"""
+        return self.ends[index] / self.TIME_BASE
+
+    def durations(self) -> "array[int]":
+        """Duration of each chapter in `TIME_BASE` units"""
+        return array("q", map(int.__sub__, self.ends, self.starts))
+
+    def total_duration(self) -> int:
+        """Sum of chapter durations in `TIME_BASE` units"""
+        return sum(self.ends) - sum(self.starts)
+
+    def cumulative_offsets(self) -> "array[int]":
+        """Offset of each chapter if chapters were laid end to end (gaps removed)"""
+        return array("q", accumulate(self.durations(), initial=0))[:-1]
+
+    def index_at(self, time: int) -> int:
+        """
+        Index of chapter playing at `time` (`TIME_BASE` units),
+        `-1` if `time` is before first chapter or after last one.
+        """
+        index = bisect_right(self.starts, time) - 1
+        if index < 0 or time >= self.ends[index]:
+            return -1
+        return index
+
+    def split_by_duration(self, max_duration: int) -> List[range]:
+        """
+        Group consecutive chapters into parts of at most `max_duration`
+        (`TIME_BASE` units). A chapter longer than `max_duration` gets its own part.
+        """
+        cumulative_ends = array("q", accumulate(self.durations()))
+        parts: List[range] = []
+        first = 0
+        part_start = 0
+
+        while first < len(self):
+            last = bisect_right(cumulative_ends, part_start + max_duration, lo=first)
+            last = max(last, first + 1)
+            parts.append(range(first, last))
+            part_start = cumulative_ends[last - 1]
+            first = last
+
+        return parts
+
+    def shifted(self, offset: int) -> "MetadataChapterTable":
+        """Return a copy with `offset` (`TIME_BASE` units) added to every chapter"""
+        return MetadataChapterTable(
+            (s + offset for s in self.starts),
+            (e + offset for e in self.ends),
+            self.titles,
+        )
+
+    def select(self, indices: Iterable[int]) -> "MetadataChapterTable":
+        """Return a table with the chapters at `indices`"""
+        indices = list(indices)
+        return MetadataChapterTable(
+            (self.starts[i] for i in indices),
+            (self.ends[i] for i in indices),
+            (self.titles[i] for i in indices),
+        )
+
+    def extend(self, table: "MetadataChapterTable") -> None:
+        """Append chapters of `table`"""
+        self.starts.extend(table.starts)
+        self.ends.extend(table.ends)
+        self.titles.extend(table.titles)
+
+    def range_between(self, start: int, end: int) -> range:
+        """Indices of chapters overlapping [`start`, `end`[ (`TIME_BASE` units)"""
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        return range(first, max(first, last))
+
+    def __str__(self) -> str:
+        return (
+            f"MetadataChapterTable(\n"
+            f"  chapters:  {len(self)}\n"
+            f"  duration:  {self.total_duration() / self.TIME_BASE}\n"
+            f")"
+        )
@@ -1,21 +1,25 @@
 """Handle audio with mutagen"""
 
+import hashlib
 from typing import Any, Optional, List
 from pathlib import Path
 import ffmpeg  # type: ignore
-from mutagen.easyid3 import EasyID3
 from mutagen.easymp4 import EasyMP4
 from mutagen.id3 import ID3
-from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4, MP4Cover
 import re
+from audiobook.audio import ID3HeaderReader
 from .metadata_chapter import MetadataChapter
+from .metadata_chapter_table import MetadataChapterTable
 
 
 class MetadataFile:
     """Handle audio file with mutagen"""
 
-    def __init__(self, path: Path | str):
+    # Freeform atom with digest of MP3 sources used to build M4B
+    SOURCE_DIGEST_ATOM = "----:com.apple.iTunes:AUDIOBOOK-SOURCE"
+
+    def __init__(self, path: Path | str, load_chapters: bool = True):
         if isinstance(path, str):
             path = Path(path)
 
@@ -25,6 +29,8 @@ class MetadataFile:
 
         self.path = path
         self.year = None
+        # Pending tag changes not saved yet
+        self.changed = False
         self._load()
 
         if not self.instance:
@@ -35,8 +41,13 @@ class MetadataFile:
         self._handle_standard_metadata()
         self._handle_custom_metadata()
 
-        self.chapters = []
-        if self.is_m4b:
+        self.chapters: List[MetadataChapter] = []
+        self.chapter_table = MetadataChapterTable()
+        # Exact duration in `MetadataChapterTable.TIME_BASE` units, with chapters
+        self.exact_duration: Optional[int] = None
+        # First audio stream from `ffprobe` (codec parameters), with chapters
+        self.audio_stream: Optional[dict[str, Any]] = None
+        if self.is_m4b and load_chapters:
             self.chapters = self._handle_chapters()
 
         self.duration = self._handle_duration()
@@ -47,9 +58,25 @@ class MetadataFile:
         for chapter in self.chapters:
             print(chapter.string)
 
-    def update_tags(self, tags: dict[str, Any]):
-        """Update tags of file"""
-        mp4 = self.mp4
+    def save(self) -> bool:
+        """Save pending tag changes, return `False` if nothing changed"""
+        if not self.changed:
+            return False
+
+        self.mp4.save()  # type: ignore
+        self.changed = False
+        return True
+
+    def _set_atom(self, atom: str, value: list[Any]) -> None:
+        """Set MP4 atom only if its value differs from the current one"""
+        if self.mp4.tags is not None and self.mp4.tags.get(atom) == value:
+            return
+
+        self.mp4[atom] = value
+        self.changed = True
+
+    def update_tags(self, tags: dict[str, Any], save: bool = True):
+        """Update tags of file, saved only if a value differs"""
 
         # 1. Mappage des tags standards
         mapping = {
@@ -71,19 +98,27 @@ class MetadataFile:
             if key in tags:
                 if tags[key]:
                     value = str(tags[key])
-                    mp4[atom] = [value]
+                    self._set_atom(atom, [value])
 
         # 2. Gestion spécifique de la piste (Tuple: (piste_actuelle, total))
         if "track" in tags:
-            mp4["trkn"] = [(int(tags["track"]), 0)]
+            self._set_atom("trkn", [(int(tags["track"]), 0)])
         if "disc" in tags:
-            mp4["disk"] = [(int(tags["disc"]), 0)]
+            self._set_atom("disk", [(int(tags["disc"]), 0)])
+
+        if save:
+            self.save()
+
+    def update_atoms(self, atoms: dict[str, list[Any]], save: bool = True):
+        """Update raw MP4 atoms, saved only if a value differs"""
+        for atom, value in atoms.items():
+            self._set_atom(atom, value)
 
-        mp4.save()  # type: ignore
+        if save:
+            self.save()
 
-    def update_tags_custom(self, tags: dict[str, Any]):
-        """Update tags custom of file"""
-        mp4 = self.mp4
+    def update_tags_custom(self, tags: dict[str, Any], save: bool = True):
+        """Update tags custom of file, saved only if a value differs"""
         # 3. Tags personnalisés (Freeform atoms)
         custom_tags = {
             "lyrics": "----:com.apple.iTunes:lyrics",
@@ -101,15 +136,16 @@ class MetadataFile:
                 # Pour les atomes '----', Mutagen attend souvent des bytes
                 if tags[key]:
                     value = str(tags[key])
-                    mp4[atom] = [value.encode("utf-8")]
+                    self._set_atom(atom, [value.encode("utf-8")])
 
-    def update_cover(self, cover_path: str):
+        if save:
+            self.save()
+
+    def update_cover(self, cover_path: str, save: bool = True):
         """
         Ajoute ou remplace la pochette du fichier M4B.
-        Supporte JPEG et PNG.
+        Supporte JPEG et PNG. Rien n'est écrit si la pochette est identique (hash).
         """
-        mp4 = self.mp4
-
         with open(cover_path, "rb") as f:
             data = f.read()
 
@@ -122,18 +158,54 @@ class MetadataFile:
             print("Format d'image non supporté (utilisez JPG ou PNG)")
             return
 
+        if self.cover_hash() == hashlib.sha256(data).hexdigest():
+            return
+
         # Créer l'objet cover et l'assigner à l'atome 'covr'
         # Note: 'covr' est une liste car un MP4 peut techniquement avoir plusieurs images
-        mp4["covr"] = [MP4Cover(data, imageformat=kind)]
+        self.mp4["covr"] = [MP4Cover(data, imageformat=kind)]
+        self.changed = True
+
+        if save:
+            self.save()
+
+    @property
+    def source_digest(self) -> Optional[str]:
+        """Digest of MP3 sources stored into M4B, see `M4bManifest`"""
+        if not self.is_m4b:
+            return None
+        return self._extract_meta_mp4(self.SOURCE_DIGEST_ATOM)
+
+    def update_source_digest(self, digest: str, save: bool = True):
+        """Store digest of MP3 sources into M4B"""
+        self._set_atom(self.SOURCE_DIGEST_ATOM, [digest.encode("utf-8")])
+
+        if save:
+            self.save()
 
-        mp4.save()  # type:ignore
+    def cover_hash(self) -> Optional[str]:
+        """SHA-256 of embedded M4B cover, `None` if there is no cover"""
+        if self.mp4.tags is None or "covr" not in self.mp4.tags:
+            return None
+
+        return hashlib.sha256(bytes(self.mp4.tags["covr"][0])).hexdigest()
+
+    def has_cover(self) -> bool:
+        """Check if media file has an embedded cover, MP3 cover is not read"""
+        if self.is_mp3:
+            return self._id3_reader.has_cover()
+        if self.is_m4b:
+            return self.mp4.tags is not None and "covr" in self.mp4.tags
+        return False
 
     def remove_cover(self):
         """Remove cover from media file"""
         if self.is_mp3:
+            # `self.id3` only holds text frames, load the full tag to save it
+            id3 = ID3(self.path)
             # Supprime toutes les frames d'images (APIC)
-            self.id3.delall("APIC")  # type: ignore
-            self.id3.save()  # type: ignore
+            id3.delall("APIC")  # type: ignore
+            id3.save()  # type: ignore
         elif self.is_m4b:
             if "covr" in self.mp4.tags:  # type: ignore
                 del self.mp4.tags["covr"]  # type: ignore
@@ -151,8 +223,10 @@ class MetadataFile:
         self.filename = p.stem
 
         if str(self.path).endswith(".mp3"):
-            self.instance = EasyID3(self.path)
-            self.id3 = ID3(self.path)
+            # Text frames only: embedded cover is skipped without being read
+            self._id3_reader = ID3HeaderReader(self.path)
+            self.instance = self._id3_reader.easy()
+            self.id3 = self._id3_reader.tags() or ID3()
             self.is_mp3 = True
             self.extension = "MP3"
         elif str(self.path).endswith(".m4b") or str(self.path).endswith(".m4a"):
@@ -241,12 +315,18 @@ class MetadataFile:
             chapter = MetadataChapter(chap)
             chapters.append(chapter)
 
+        self.chapter_table = MetadataChapterTable.from_probe(chaps)
+        self.exact_duration = MetadataChapterTable.duration_from_probe(probe)
+        self.audio_stream = next(
+            (s for s in probe.get("streams", []) if s.get("codec_type") == "audio"),
+            None,
+        )
+
         return chapters
 
     def _handle_duration(self):
         if self.is_mp3:
-            audio = MP3(self.path)
-            return int(audio.info.length)
+            return int(self._id3_reader.info().length)
         elif self.is_m4b:
             return int(self.mp4.info.length)
         else:
@@ -1,12 +1,13 @@
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
+import tempfile
 from pathlib import Path
-from audiobook.metadata import MetadataFile
+from audiobook.audio import ID3HeaderReader
 import audiobook.utils as utils
-import json
 import mutagen
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from mutagen.mp4 import MP4, MP4FreeForm
 from mutagen.id3 import ID3, TXXX, CHAP, CTOC, Encoding
 import mutagen.id3
@@ -15,41 +16,50 @@ MetadataDict = Dict[str, Dict[str, Any]]
 
 
 class Mp3Fusion:
-    def __init__(self, mp3_list: list[str]):
+    def __init__(self, mp3_list: list[str], max_workers: Optional[int] = None):
         self._mp3_list = mp3_list
 
-        items: dict[str, str] = {}
-        for path in self._mp3_list:
-            file = MetadataFile(path)
-            items.update({path: str(file.title)})
+        # Seule la frame `TIT2` sert au regroupement : lecture des en-têtes ID3
+        # uniquement (ni cover, ni ffprobe), en parallèle
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            titles = list(
+                executor.map(lambda p: ID3HeaderReader(p).title(), self._mp3_list)
+            )
 
         grouped_data: dict[str, list[str]] = defaultdict(list)
 
-        for filename, title in items.items():
-            grouped_data[title].append(filename)
-
-        for title, files in grouped_data.items():
-            if len(files) > 1:
-                self._fusion(files)
-
-    def _fusion(self, files: list[str]):
+        for filename, title in zip(self._mp3_list, titles):
+            # Fichiers sans titre : rien ne permet de les regrouper
+            if title is not None:
+                grouped_data[title].append(filename)
+
+        # Groupes indépendants (dossier temporaire propre) : fusionnés en parallèle
+        groups = [files for files in grouped_data.values() if len(files) > 1]
+        if groups:
+            with ThreadPoolExecutor(
+                max_workers=max_workers or os.cpu_count()
+            ) as executor:
+                # `map` rend les résultats dans l'ordre des groupes : sortie ordonnée
+                for message in executor.map(self._fusion, groups):
+                    print(message)
+
+    def _fusion(self, files: list[str]) -> str:
         """
         Fusionne une liste de fichiers MP3 dans l'ordre de la liste.
         Conserve les métadonnées du premier fichier.
+        Retourne le résultat à afficher.
         """
-        first_file = Path(files[0])
-        first_file_no_ext = first_file.with_suffix("")
-        output_file = f"{first_file_no_ext}_fusion.mp3"
+        if not files:
+            return "La liste de fichiers est vide."
 
+        first_file = Path(files[0])
         metadata = self._extract_metadata(str(first_file))
-        print(metadata)
-
-        if not files:
-            print("La liste de fichiers est vide.")
-            return
 
-        # Nom du fichier temporaire pour la liste
-        temp_list_file = "concat_list.txt"
+        # Dossier temporaire par groupe, à côté des sources : pas de collision
+        # entre groupes et `os.replace` atomique (même système de fichiers)
+        temp_dir = tempfile.mkdtemp(prefix=".fusion_", dir=first_file.parent)
+        temp_list_file = os.path.join(temp_dir, "concat_list.txt")
+        output_file = os.path.join(temp_dir, first_file.name)
 
         try:
             # 1. Création du fichier de configuration pour ffmpeg
@@ -79,57 +89,37 @@ class Mp3Fusion:
 
             # Exécution (capture_output permet de voir les erreurs ffmpeg en cas de crash)
             subprocess.run(command, check=True, capture_output=True)
-            print(f"✅ Fusion terminée avec succès : {output_file}")
+
+            # 3. Tags puis mise en place : renommage atomique, sans copie
+            injected = self._inject_metadata(output_file, metadata)
+            os.replace(output_file, first_file)
+            for path in files[1:]:
+                utils.delete_file(path)
+            if not injected:
+                return f"⚠️ Fusion terminée, tags non réinjectés : {first_file}"
+            return f"✅ Fusion terminée avec succès : {first_file}"
 
         except subprocess.CalledProcessError as e:
-            print(f"❌ Erreur FFmpeg : {e.stderr.decode()}")
+            # Sources conservées en cas d'échec
+            return f"❌ Erreur FFmpeg : {e.stderr.decode()}"
         finally:
-            # 3. Nettoyage
-            if os.path.exists(temp_list_file):
-                os.remove(temp_list_file)
+            # 4. Nettoyage
+            utils.delete_directory(temp_dir)
 
-            for path in files:
-                utils.delete_file(path)
+    def _extract_metadata(self, path: str) -> MetadataDict:
+        """
+        Tags du fichier à réinjecter après la fusion, en une lecture : frames
+        texte de l'en-tête ID3 (clés ID3 comme 'TIT2', 'TXXX:SERIES')
+        """
+        tags = ID3HeaderReader(path).tags()
+        tags_extracted: Dict[str, Any] = {}
+
+        if tags:
+            for key in tags.keys():
+                # On convertit tout en string pour éviter les types 'Unknown'
+                tags_extracted[str(key)] = str(tags[key])
 
-            new_file = utils.copy_file(output_file, str(first_file))
-            self._inject_metadata(new_file, metadata)
-            utils.delete_file(output_file)
-
-    def _extract_metadata(self, path: str) -> Dict[str, Dict[str, Any]]:
-        # 1. Analyse structurelle (Atoms pour M4B / Frames pour MP3)
-        # On demande à FFprobe de lister les 'entries' de métadonnées
-        cmd = [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-show_format",
-            "-show_streams",
-            "-show_chapters",
-            "-print_format",
-            "json",
-            path,
-        ]
-        ff_data = json.loads(subprocess.check_output(cmd).decode("utf-8"))
-
-        # 2. Analyse des Tags via Mutagen
-        audio = mutagen.File(path)
-        tags_extracted = {}
-
-        if audio:
-            # On convertit tout en string pour éviter les types 'Unknown'
-            # Pour les M4B, Mutagen renverra les clés sous forme d'Atoms (ex: '©nam')
-            # Pour les MP3, ce sera les clés ID3 (ex: 'TIT2')
-            for key in audio.keys():
-                val = audio[key]
-                # Gestion des listes (souvent les tags sont des listes dans Mutagen)
-                tags_extracted[str(key)] = (
-                    val[0] if isinstance(val, list) and len(val) > 0 else str(val)
-                )
-
-        return {
-            "structure": ff_data,  # Contient les chapitres du M4B et les flux
-            "tags": tags_extracted,
-        }
+        return {"tags": tags_extracted}
 
     def _inject_metadata(self, path: str, full_metadata_dict: Dict[str, Any]) -> bool:
         try:
@@ -193,7 +183,6 @@ class Mp3Fusion:
 
                 tags.save(path, v2_version=3)  # v2.3 est souvent plus compatible
 
-            print(f"Injection terminée pour : {path}")
             return True
 
         except Exception as e:
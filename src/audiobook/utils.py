@@ -4,8 +4,7 @@ from typing import Optional, Union
 import os
 import platform
 import subprocess
-from mutagen.easyid3 import EasyID3
-from mutagen.mp3 import MP3
+from audiobook.audio.id3_header_reader import ID3HeaderReader
 
 
 def path_join(base_path: str, *add_paths: str):
@@ -67,21 +66,12 @@ def get_mp3_title(filepath: str) -> str:
         return filepath
 
     try:
-        # EasyID3 handles standard tags like 'title', 'artist', etc., very simply
-        audio = EasyID3(filepath)
-
-        if "title" in audio and audio["title"][0]:
-            return audio["title"][0]  # type: ignore
-
+        # Only text frames are read, embedded cover is skipped
+        title = ID3HeaderReader(filepath).title()
+        if title:
+            return title
     except Exception:
-        # Fallback if EasyID3 fails (e.g., no ID3 tags present)
-        try:
-            audio = MP3(filepath)
-            # Some files might have different tag structures
-            if audio.tags and "TIT2" in audio.tags:  # type: ignore
-                return str(audio.tags["TIT2"])  # type: ignore
-        except Exception:
-            pass
+        pass
 
     # Final fallback: return the filename without extension
     return os.path.splitext(os.path.basename(filepath))[0]
@@ -199,6 +189,9 @@ def rename_file(absolute_path: str, new_name: str) -> str:
     path = Path(absolute_path)
     new_path = path.with_name(new_name + path.suffix)
 
+    if new_path == path:
+        return str(path.resolve())
+
     if new_path.exists():
         new_path.unlink()
 
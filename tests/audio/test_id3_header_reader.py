@@ -0,0 +1,118 @@
+import struct
+import pytest
+from mutagen.id3 import APIC, COMM, ID3, TALB, TIT2, TPE1, TXXX, ID3NoHeaderError
+from audiobook.audio.id3_header_reader import ID3HeaderReader
+
+# Frames MPEG factices : le lecteur ne décode pas l'audio
+AUDIO = (b"\xff\xfb\x90\x00" + bytes(413)) * 8
+
+
+def _write_tagged(path, version, cover):
+    path.write_bytes(AUDIO)
+    tags = ID3()
+    tags.add(TIT2(encoding=3, text=["Chapitre 1 : Le départ"]))
+    tags.add(TPE1(encoding=3, text=["Jean Auteur"]))
+    tags.add(TALB(encoding=3, text=["Mon Livre"]))
+    tags.add(COMM(encoding=3, lang="fra", desc="", text=["Un commentaire"]))
+    tags.add(TXXX(encoding=3, desc="AUDIOBOOK_CLEAN", text=["trim=30"]))
+    if cover:
+        tags.add(
+            APIC(encoding=3, mime="image/jpeg", type=3, desc="", data=bytes(50_000))
+        )
+    tags.save(str(path), v2_version=version)
+    return path
+
+
+def _add_extended_header(path, version):
+    """Insère un en-tête étendu (sans CRC ni restriction) après l'en-tête ID3v2"""
+    data = path.read_bytes()
+    if version == 4:
+        # Taille syncsafe (en-tête compris), 1 octet de flags, flags à zéro
+        extended = bytes([0, 0, 0, 6, 1, 0])
+    else:
+        # Taille (sans elle-même), flags, taille du padding
+        extended = struct.pack(">LHL", 6, 0, 0)
+    size = ID3HeaderReader._syncsafe(data[6:10]) + len(extended)
+    header = data[:5] + bytes([data[5] | 0x40]) + ID3HeaderReader._to_syncsafe(size)
+    path.write_bytes(header + extended + data[10:])
+    return path
+
+
+def _text_frames(tags):
+    """Frames texte comparables (les autres ne sont pas lues par le lecteur)"""
+    if tags is None:
+        return None
+    return {
+        key: str(frame)
+        for key, frame in tags.items()
+        if key.startswith("T") or key.startswith(("COMM", "USLT"))
+    }
+
+
+def _full_tags(path):
+    try:
+        return ID3(str(path))
+    except ID3NoHeaderError:
+        return None
+
+
+def _assert_same_as_mutagen(path):
+    reader = ID3HeaderReader(path)
+    full = _full_tags(path)
+
+    assert _text_frames(reader.tags()) == _text_frames(full)
+    expected_title = str(full["TIT2"].text[0]) if full and "TIT2" in full else None
+    assert reader.title() == expected_title
+    assert reader.has_cover() == bool(full and full.getall("APIC"))
+    return reader
+
+
+@pytest.mark.parametrize("version", [3, 4])
+@pytest.mark.parametrize("cover", [False, True], ids=["no_cover", "cover"])
+def test_tagged_file(tmp_path, version, cover):
+    path = _write_tagged(tmp_path / "chapter.mp3", version, cover)
+
+    reader = _assert_same_as_mutagen(path)
+    assert reader.title() == "Chapitre 1 : Le départ"
+    assert reader.has_cover() is cover
+    assert reader.tags().version[:2] == (2, version)
+    # Premier octet audio juste après le tag (padding compris)
+    assert path.read_bytes()[reader.tag_size :] == AUDIO
+
+
+@pytest.mark.parametrize("version", [3, 4])
+def test_extended_header(tmp_path, version):
+    path = _write_tagged(tmp_path / "chapter.mp3", version, cover=True)
+    path = _add_extended_header(path, version)
+
+    reader = _assert_same_as_mutagen(path)
+    assert reader.title() == "Chapitre 1 : Le départ"
+    assert reader.has_cover()
+
+
+def test_file_without_tag(tmp_path):
+    path = tmp_path / "chapter.mp3"
+    path.write_bytes(AUDIO)
+
+    reader = _assert_same_as_mutagen(path)
+    assert reader.tags() is None
+    assert reader.title() is None
+    assert reader.tag_size == 0
+
+
+def test_file_with_id3v1_only(tmp_path):
+    path = tmp_path / "chapter.mp3"
+    v1 = (
+        b"TAG"
+        + b"Titre v1".ljust(30, b"\x00")
+        + b"Artiste v1".ljust(30, b"\x00")
+        + b"Album v1".ljust(30, b"\x00")
+        + b"2024"
+        + bytes(30)
+        + b"\xff"
+    )
+    path.write_bytes(AUDIO + v1)
+
+    reader = _assert_same_as_mutagen(path)
+    assert reader.title() == "Titre v1"
+    assert reader.tag_size == 0
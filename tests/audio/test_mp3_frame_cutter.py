@@ -0,0 +1,84 @@
+import shutil
+import struct
+import subprocess
+import pytest
+from audiobook.audio.mp3_frame_cutter import Mp3FrameCutter, _crc16
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg non disponible"
+)
+
+SAMPLE_RATE = 44100
+
+
+def _encode(path, *args):
+    """MP3 de 10 s (sinusoïde) encodé par FFmpeg avec en-tête Xing/Info + LAME"""
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", "-f", "lavfi"]
+        + ["-i", f"sine=frequency=440:duration=10:sample_rate={SAMPLE_RATE}"]
+        + ["-c:a", "libmp3lame", *args, str(path)],
+        check=True,
+    )
+    return path
+
+
+def _decoded_duration(path):
+    """Durée réellement décodée par FFmpeg (retard/remplissage LAME retirés)"""
+    pcm = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", str(path)]
+        + ["-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        check=True,
+        capture_output=True,
+    ).stdout
+    return len(pcm) / 2 / SAMPLE_RATE
+
+
+def _xing_fields(cutter):
+    """Champs Xing (frames, octets) et tag LAME (longueur, CRC, position du CRC)"""
+    start = cutter.xing.offset
+    frame = cutter._data[start : start + cutter.xing.size]
+    position = cutter._xing_offset + 4
+    flags, frames, size = struct.unpack(">III", frame[position : position + 12])
+    assert flags & 0x7 == 0x7
+    lame = position + 12 + 100 + (4 if flags & 0x8 else 0)
+    music_length, _, tag_crc = struct.unpack(">IHH", frame[lame + 28 : lame + 36])
+    return frames, size, music_length, tag_crc, frame[: lame + 34]
+
+
+@pytest.fixture(params=[["-b:a", "64k", "-ac", "1"], ["-q:a", "4"]], ids=["cbr", "vbr"])
+def mp3_file(request, tmp_path):
+    return _encode(tmp_path / "source.mp3", *request.param)
+
+
+def test_cut_updates_xing_and_lame(mp3_file, tmp_path):
+    source = Mp3FrameCutter(mp3_file)
+    output = tmp_path / "cut.mp3"
+
+    removed = source.cut([(2.0, 4.0), (6.0, 6.5)], output)
+
+    # Frames entières seulement, moins celles gardées pour le bit reservoir
+    removed_frames = round(removed * SAMPLE_RATE / 1152)
+    assert 1.5 < removed <= 2.5
+    cut = Mp3FrameCutter(output)
+    assert len(cut.frames) == len(source.frames) - removed_frames
+
+    frames, size, music_length, tag_crc, tag = _xing_fields(cut)
+    assert frames == len(cut.frames)
+    assert size == output.stat().st_size - cut.tag_size
+    assert music_length == size
+    assert tag_crc == _crc16(tag)
+
+    # Retard et remplissage de l'encodeur inchangés : même écart au décodage
+    expected = _decoded_duration(mp3_file) - removed
+    assert _decoded_duration(output) == pytest.approx(expected, abs=1e-3)
+
+
+def test_cut_without_interval_keeps_all_frames(mp3_file, tmp_path):
+    source = Mp3FrameCutter(mp3_file)
+    output = tmp_path / "cut.mp3"
+
+    assert source.cut([], output) == 0
+    cut = Mp3FrameCutter(output)
+    assert [f.size for f in cut.frames] == [f.size for f in source.frames]
+    assert cut.duration == pytest.approx(source.duration)
+    assert _xing_fields(cut)[:3] == _xing_fields(source)[:3]